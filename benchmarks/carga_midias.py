@@ -0,0 +1,82 @@
+"""Benchmark de Catalogo.carregar_midias.
+
+Popula bancos temporários com um número crescente de séries (com elenco em
+Ator/MidiaAtor, temporadas e episódios) e mede o tempo de carga e a
+quantidade de consultas SQL emitidas. Com a hidratação em lote o
+número de consultas é constante e o tempo cresce apenas com o volume de linhas.
+A carga padrão lê só o resumo das séries; a coluna "prefetch" inclui a leitura
+das árvores de temporadas e episódios (carregar_midias(prefetch=True)).
+
+Uso: python -m benchmarks.carga_midias
+"""
+import tempfile
+import time
+from pathlib import Path
+
+from catalogo import Catalogo
+from midia import Episodio, Temporada
+from midia_concreta import Serie
+
+ESCALAS = (100, 500, 2000)
+TEMPORADAS_POR_SERIE = 3
+EPISODIOS_POR_TEMPORADA = 10
+ATORES_POR_SERIE = 4
+NUM_ATORES = 1000
+
+
+def popular(db_path: Path, num_series: int):
+
+    # Pelo caminho de escrita normal, que grava o elenco em Ator/MidiaAtor:
+    # a carga mede também a hidratação do elenco em lote.
+    def series():
+        for i in range(num_series):
+            elenco = [f"Ator {(i * ATORES_POR_SERIE + j) % NUM_ATORES:04d}"
+                      for j in range(ATORES_POR_SERIE)]
+            serie = Serie(f"Série {i:05d}", "Drama", 2000 + i % 25, elenco)
+            for t in range(1, TEMPORADAS_POR_SERIE + 1):
+                temporada = Temporada(t, f"Temporada {t}")
+                for e in range(1, EPISODIOS_POR_TEMPORADA + 1):
+                    temporada.adicionar_episodio(Episodio(e, f"Episódio {e}", 45))
+                serie.adicionar_temporada(temporada)
+            yield serie
+
+    catalogo = Catalogo(db_path=db_path, carregar=False)
+    catalogo.adicionar_midias_em_lote(series())
+    catalogo.fechar_conexao()
+
+
+def medir(db_path: Path, prefetch: bool = False, repeticoes: int = 3):
+
+    catalogo = Catalogo(db_path=db_path)
+    consultas = []
+    catalogo.conn.set_trace_callback(consultas.append)
+
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        consultas.clear()
+        inicio = time.perf_counter()
+        catalogo.carregar_midias(forcar=True, prefetch=prefetch)
+        melhor = min(melhor, time.perf_counter() - inicio)
+
+    catalogo.conn.set_trace_callback(None)
+    catalogo.fechar_conexao()
+    return melhor, len(consultas)
+
+
+def main():
+
+    print(f"{'séries':>8} {'episódios':>10} {'consultas':>10} {'tempo (ms)':>12} "
+          f"{'prefetch (ms)':>14} {'µs/episódio':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for num_series in ESCALAS:
+            db_path = Path(tmp) / f"bench_{num_series}.db"
+            popular(db_path, num_series)
+            tempo, num_consultas = medir(db_path)
+            tempo_prefetch, _ = medir(db_path, prefetch=True)
+            episodios = num_series * TEMPORADAS_POR_SERIE * EPISODIOS_POR_TEMPORADA
+            print(f"{num_series:>8} {episodios:>10} {num_consultas:>10} {tempo * 1000:>12.1f} "
+                  f"{tempo_prefetch * 1000:>14.1f} {tempo_prefetch * 1e6 / episodios:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
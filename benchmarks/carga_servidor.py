@@ -0,0 +1,144 @@
+"""Teste de carga da API HTTP (servidor.py) em localhost.
+
+Clientes em threads, cada um com uma conexão keep-alive, fazem polls às
+estatísticas, à primeira página da listagem, a mídias por id e à busca, de
+três formas: sem ETag (toda resposta é montada ou vem do cache do
+servidor), com If-None-Match (os polls repetidos custam um 304) e com uma
+escrita de outra conexão a cada tanto, invalidando os ETags. Mostra a
+vazão, os percentis de latência e a fração de respostas 304.
+
+Sem --porta, sobe um servidor num banco temporário populado; com --porta,
+usa um servidor já em execução em localhost.
+
+Uso: python -m benchmarks.carga_servidor [--porta 8000] [--clientes 4]
+     [--segundos 3]
+"""
+import argparse
+import http.client
+import json
+import random
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from benchmarks.ingestao_lote import gerar_midias
+from catalogo import Catalogo
+from midia_concreta import Filme
+from servidor import criar_servidor
+
+TAMANHO_BASE = 5000
+INTERVALO_ESCRITAS_SEGUNDOS = 0.2
+
+
+def caminhos(porta: int) -> List[str]:
+
+    conn = http.client.HTTPConnection("127.0.0.1", porta)
+    conn.request("GET", "/midias?tamanho=50")
+    ids = [m['id'] for m in json.loads(conn.getresponse().read())['midias']]
+    conn.close()
+    return (["/estatisticas", "/midias?tamanho=20", "/busca?q=Serie"]
+            + [f"/midias/{midia_id}" for midia_id in ids[:10]])
+
+
+def cliente(porta: int, rotas: List[str], usar_etag: bool, parar: threading.Event,
+            latencias: List[float], contagem: Dict[int, int], semente: int):
+
+    aleatorio = random.Random(semente)
+    conn = http.client.HTTPConnection("127.0.0.1", porta)
+    etags: Dict[str, str] = {}
+    while not parar.is_set():
+        rota = aleatorio.choice(rotas)
+        cabecalhos = {"If-None-Match": etags[rota]} if usar_etag and rota in etags else {}
+        inicio = time.perf_counter()
+        conn.request("GET", rota, headers=cabecalhos)
+        resposta = conn.getresponse()
+        resposta.read()
+        latencias.append((time.perf_counter() - inicio) * 1000)
+        contagem[resposta.status] = contagem.get(resposta.status, 0) + 1
+        if resposta.getheader("ETag"):
+            etags[rota] = resposta.getheader("ETag")
+    conn.close()
+
+
+def escritor(db_path: Path, parar: threading.Event):
+
+    catalogo = Catalogo(db_path=db_path, carregar=False, perfil="producao")
+    i = 0
+    while not parar.wait(INTERVALO_ESCRITAS_SEGUNDOS):
+        catalogo.adicionar_midia(Filme(f"Carga {i:06d}", "Drama", 2001, 100, ["Ator A"]))
+        i += 1
+    catalogo.fechar_conexao()
+
+
+def medir(porta: int, rotas: List[str], clientes: int, segundos: float, usar_etag: bool,
+          db_escritas: Optional[Path] = None):
+
+    parar = threading.Event()
+    latencias: List[List[float]] = [[] for _ in range(clientes)]
+    contagens: List[Dict[int, int]] = [{} for _ in range(clientes)]
+    threads = [threading.Thread(target=cliente, args=(porta, rotas, usar_etag, parar,
+                                                      latencias[i], contagens[i], i))
+               for i in range(clientes)]
+    if db_escritas is not None:
+        threads.append(threading.Thread(target=escritor, args=(db_escritas, parar)))
+    for thread in threads:
+        thread.start()
+    time.sleep(segundos)
+    parar.set()
+    for thread in threads:
+        thread.join()
+
+    todas = sorted(l for lista in latencias for l in lista)
+    total = len(todas)
+    nao_modificadas = sum(c.get(304, 0) for c in contagens)
+    return (total / segundos, statistics.median(todas), todas[int(total * 0.99)],
+            nao_modificadas / total)
+
+
+def executar(porta: int, clientes: int, segundos: float, db_path: Optional[Path]):
+
+    rotas = caminhos(porta)
+    cenarios = [("sem etag", False, None), ("com etag", True, None)]
+    if db_path is not None:
+        cenarios.append(("etag+escritas", True, db_path))
+
+    print(f"{'cenário':>14} {'req/s':>8} {'p50 (ms)':>9} {'p99 (ms)':>9} {'304':>6}")
+    for nome, usar_etag, db_escritas in cenarios:
+        vazao, p50, p99, fracao = medir(porta, rotas, clientes, segundos, usar_etag, db_escritas)
+        print(f"{nome:>14} {vazao:>8.0f} {p50:>9.2f} {p99:>9.2f} {fracao:>6.0%}")
+
+
+def main(argv: Optional[List[str]] = None):
+
+    parser = argparse.ArgumentParser(description="Teste de carga da API HTTP do catálogo.")
+    parser.add_argument("--porta", type=int, help="usa um servidor já em execução em localhost")
+    parser.add_argument("--clientes", type=int, default=4)
+    parser.add_argument("--segundos", type=float, default=3.0)
+    args = parser.parse_args(argv)
+
+    if args.porta is not None:
+        executar(args.porta, args.clientes, args.segundos, None)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        catalogo = Catalogo(db_path=db_path, carregar=False, perfil="producao")
+        catalogo.adicionar_midias_em_lote(gerar_midias(TAMANHO_BASE))
+        catalogo.fechar_conexao()
+
+        servidor = criar_servidor(db_path, porta=0, threads=max(8, args.clientes))
+        thread = threading.Thread(target=servidor.serve_forever, daemon=True)
+        thread.start()
+        try:
+            executar(servidor.server_address[1], args.clientes, args.segundos, db_path)
+        finally:
+            servidor.shutdown()
+            servidor.server_close()
+            servidor.api.catalogo.fechar_conexao()
+
+
+if __name__ == "__main__":
+    main()
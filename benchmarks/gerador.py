@@ -0,0 +1,127 @@
+"""Gerador de catálogos sintéticos com semente fixa para os benchmarks.
+
+As distribuições imitam um catálogo real: gêneros e atores seguem uma lei
+de Zipf (poucos muito frequentes, muitos raros), anos concentrados nas
+décadas recentes, a maioria das séries com poucas temporadas curtas e
+algumas muito longas (formato colunar), e avaliações só nas mídias
+concluídas. A mesma semente gera sempre o mesmo catálogo, então resultados
+de commits diferentes são comparáveis.
+"""
+import bisect
+import itertools
+import random
+from typing import Iterator, List
+
+from midia import Episodio, Midia, StatusVisualizacao, Temporada
+from midia_concreta import Filme, Serie
+
+GENEROS = (
+    "Drama", "Comédia", "Ação", "Suspense", "Terror", "Ficção Científica",
+    "Romance", "Animação", "Documentário", "Fantasia", "Crime", "Aventura",
+    "Mistério", "Musical", "Guerra", "Faroeste", "Biografia", "Histórico",
+)
+STATUS_PESOS = (
+    (StatusVisualizacao.PENDENTE, 0.40),
+    (StatusVisualizacao.ASSISTINDO, 0.10),
+    (StatusVisualizacao.CONCLUIDO, 0.42),
+    (StatusVisualizacao.ABANDONADO, 0.08),
+)
+PALAVRAS = (
+    "Noite", "Cidade", "Sombra", "Último", "Reino", "Fogo", "Mar", "Segredo",
+    "Estrada", "Vento", "Silêncio", "Jogo", "Sangue", "Ouro", "Lua", "Tempo",
+    "Casa", "Guerra", "Sonho", "Rio", "Verão", "Inverno", "Caminho", "Herança",
+)
+NUM_ATORES = 20000
+EXPOENTE_ZIPF = 1.1
+# Fração das séries com temporadas longas (novelas, animes, talk shows).
+PROPORCAO_SERIES_LONGAS = 0.02
+
+
+class _Zipf:
+    """Sorteia índices 0..n-1 com probabilidade proporcional a 1/(k+1)^s."""
+
+    def __init__(self, n: int, expoente: float = EXPOENTE_ZIPF):
+        self._acumulados = list(itertools.accumulate(1 / (k + 1) ** expoente for k in range(n)))
+
+    def sortear(self, aleatorio: random.Random) -> int:
+        return bisect.bisect(self._acumulados, aleatorio.random() * self._acumulados[-1])
+
+
+class GeradorCatalogo:
+    """Mídias sintéticas determinísticas a partir de uma semente."""
+
+    def __init__(self, semente: int = 42, num_atores: int = NUM_ATORES):
+        self.semente = semente
+        self._aleatorio = random.Random(semente)
+        self._generos = _Zipf(len(GENEROS))
+        self._atores = _Zipf(num_atores)
+        self._nomes_atores = [f"Ator {i:05d}" for i in range(num_atores)]
+        self._status = [s for s, _ in STATUS_PESOS]
+        self._pesos_status = [p for _, p in STATUS_PESOS]
+        self._contador = itertools.count()
+
+    def _titulo(self) -> str:
+
+        a = self._aleatorio
+        # O número no fim mantém os títulos únicos, como no catálogo real.
+        return f"{a.choice(PALAVRAS)} {a.choice(PALAVRAS).lower()} {next(self._contador):07d}"
+
+    def _ano(self) -> int:
+
+        # Mais lançamentos recentes: 1950-2024 com densidade crescente.
+        return 2024 - int(74 * (1 - self._aleatorio.random() ** 0.5))
+
+    def _elenco(self) -> List[str]:
+
+        quantidade = self._aleatorio.randint(2, 8)
+        return list(dict.fromkeys(self._nomes_atores[self._atores.sortear(self._aleatorio)]
+                                  for _ in range(quantidade)))
+
+    def _comum(self):
+
+        a = self._aleatorio
+        status = a.choices(self._status, self._pesos_status)[0]
+        avaliacao = round(a.triangular(1, 10, 7.5), 1) if status == StatusVisualizacao.CONCLUIDO else 0.0
+        return GENEROS[self._generos.sortear(a)], self._ano(), self._elenco(), status, avaliacao
+
+    def filme(self) -> Filme:
+
+        genero, ano, elenco, status, avaliacao = self._comum()
+        duracao = max(60, min(240, int(self._aleatorio.gauss(110, 22))))
+        return Filme(self._titulo(), genero, ano, duracao, elenco, status, avaliacao)
+
+    def serie(self) -> Serie:
+
+        a = self._aleatorio
+        genero, ano, elenco, status, avaliacao = self._comum()
+        serie = Serie(self._titulo(), genero, ano, elenco, status, avaliacao)
+        longa = a.random() < PROPORCAO_SERIES_LONGAS
+        # Número de temporadas com cauda longa: a maioria tem 1 a 3.
+        num_temporadas = min(1 + int(a.expovariate(0.6)), 15)
+        duracao_base = a.choice((22, 30, 45, 60))
+        for t in range(1, num_temporadas + 1):
+            temporada = Temporada(t, f"Temporada {t}")
+            num_episodios = a.randint(100, 300) if longa else a.randint(6, 24)
+            for e in range(1, num_episodios + 1):
+                temporada.adicionar_episodio(
+                    Episodio(e, f"Episódio {e}", max(10, duracao_base + a.randint(-5, 5))))
+            serie.adicionar_temporada(temporada)
+        return serie
+
+    def midias(self, num_filmes: int, num_series: int) -> Iterator[Midia]:
+        """Filmes e séries intercalados, na proporção pedida."""
+
+        total = num_filmes + num_series
+        series_geradas = 0
+        for i in range(total):
+            # Distribui as séries ao longo da sequência em vez de no fim.
+            if series_geradas < num_series and (i + 1) * num_series >= (series_geradas + 1) * total:
+                series_geradas += 1
+                yield self.serie()
+            else:
+                yield self.filme()
+
+
+def gerar_catalogo(num_filmes: int, num_series: int, semente: int = 42) -> Iterator[Midia]:
+
+    return GeradorCatalogo(semente).midias(num_filmes, num_series)
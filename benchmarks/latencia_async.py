@@ -0,0 +1,144 @@
+"""Benchmark de latência do event loop com o AsyncCatalogo.
+
+Uma corrotina sentinela dorme INTERVALO_MS em laço e registra o atraso com
+que acorda (a latência do loop). Enquanto isso, rajadas de requisições
+simultâneas (estatísticas, páginas, buscas e inserções) são feitas de duas
+formas: chamando o Catalogo síncrono direto no loop e pelo AsyncCatalogo.
+Para cada forma, mostra a vazão, os percentis do atraso do loop e quantos
+cálculos de estatísticas foram de fato executados (leituras agrupadas).
+
+Uso: python -m benchmarks.latencia_async
+"""
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from benchmarks.ingestao_lote import gerar_midias
+from catalogo import Catalogo
+from catalogo_async import AsyncCatalogo
+from midia_concreta import Filme
+
+TAMANHO_BASE = 5000
+RAJADAS = 30
+REQUISICOES_POR_RAJADA = 20
+INTERVALO_MS = 1.0
+
+
+async def sentinela(atrasos: List[float], parar: asyncio.Event):
+
+    intervalo = INTERVALO_MS / 1000
+    while not parar.is_set():
+        inicio = time.perf_counter()
+        await asyncio.sleep(intervalo)
+        atrasos.append((time.perf_counter() - inicio - intervalo) * 1000)
+
+
+def contar_chamadas(catalogo: Catalogo, nome: str) -> List[int]:
+
+    contador = [0]
+    original = getattr(catalogo, nome)
+
+    def contado(*args, **kwargs):
+        contador[0] += 1
+        return original(*args, **kwargs)
+    setattr(catalogo, nome, contado)
+    return contador
+
+
+async def rajada(operacao: Callable[[int], object], num_rajada: int):
+
+    # Requisições simultâneas: 3/4 pedem as estatísticas, o resto se divide
+    # entre páginas, buscas e inserções.
+    await asyncio.gather(*(operacao(num_rajada * REQUISICOES_POR_RAJADA + i)
+                           for i in range(REQUISICOES_POR_RAJADA)))
+
+
+async def medir(operacao: Callable[[int], object]):
+
+    atrasos: List[float] = []
+    parar = asyncio.Event()
+    tarefa = asyncio.create_task(sentinela(atrasos, parar))
+    inicio = time.perf_counter()
+    for num_rajada in range(RAJADAS):
+        await rajada(operacao, num_rajada)
+        await asyncio.sleep(0.005)
+    duracao = time.perf_counter() - inicio
+    parar.set()
+    await tarefa
+    atrasos.sort()
+    return (RAJADAS * REQUISICOES_POR_RAJADA / duracao,
+            statistics.median(atrasos), atrasos[int(len(atrasos) * 0.99)], atrasos[-1])
+
+
+def escolher(i: int) -> str:
+
+    return ("estatisticas", "estatisticas", "estatisticas", "outra")[i % 4]
+
+
+async def medir_sincrono(db_path: Path):
+
+    catalogo = Catalogo(db_path=db_path, carregar=False, perfil="producao")
+    contador = contar_chamadas(catalogo, "obter_estatisticas_gerais")
+    aleatorio = random.Random(42)
+
+    async def operacao(i: int):
+        if escolher(i) == "estatisticas":
+            return catalogo.obter_estatisticas_gerais()
+        if i % 3 == 0:
+            return catalogo.adicionar_midia(Filme(f"Síncrono {i:05d}", "Drama", 2001, 100, ["Ator A"]))
+        if i % 3 == 1:
+            return catalogo.pagina_midias(20)
+        return catalogo.buscar(f"Série {aleatorio.randrange(1000):03d}")
+
+    resultado = await medir(operacao)
+    catalogo.fechar_conexao()
+    return resultado + (contador[0],)
+
+
+async def medir_assincrono(db_path: Path):
+
+    async with AsyncCatalogo(db_path=db_path, carregar=False) as catalogo:
+        contador = contar_chamadas(catalogo.catalogo, "obter_estatisticas_gerais")
+        aleatorio = random.Random(42)
+
+        async def operacao(i: int):
+            if escolher(i) == "estatisticas":
+                return await catalogo.obter_estatisticas_gerais()
+            if i % 3 == 0:
+                return await catalogo.adicionar_midia(
+                    Filme(f"Assíncrono {i:05d}", "Drama", 2001, 100, ["Ator A"]))
+            if i % 3 == 1:
+                return await catalogo.pagina_midias(20)
+            return await catalogo.buscar(f"Série {aleatorio.randrange(1000):03d}")
+
+        resultado = await medir(operacao)
+    return resultado + (contador[0],)
+
+
+async def principal():
+
+    print(f"{'modo':>11} {'req/s':>7} {'atraso p50':>11} {'p99':>7} {'máx':>7} {'estatísticas':>13}")
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        catalogo = Catalogo(db_path=db_path, carregar=False, perfil="producao")
+        catalogo.adicionar_midias_em_lote(gerar_midias(TAMANHO_BASE))
+        catalogo.fechar_conexao()
+
+        pedidas = RAJADAS * sum(escolher(i) == "estatisticas" for i in range(REQUISICOES_POR_RAJADA))
+        for nome, medicao in (("síncrono", medir_sincrono), ("assíncrono", medir_assincrono)):
+            vazao, p50, p99, maximo, calculadas = await medicao(db_path)
+            print(f"{nome:>11} {vazao:>7.0f} {p50:>9.2f}ms {p99:>5.1f}ms {maximo:>5.1f}ms "
+                  f"{calculadas:>6}/{pedidas}")
+
+
+def main():
+
+    asyncio.run(principal())
+
+
+if __name__ == "__main__":
+    main()
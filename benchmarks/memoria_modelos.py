@@ -0,0 +1,107 @@
+"""Benchmark de memória e tempo de hidratação dos modelos.
+
+Mede com tracemalloc os bytes alocados por objeto de cada classe do modelo
+(Episodio, Temporada, Filme, Serie), o custo por episódio de uma temporada
+em lista e no formato colunar (EpisodiosColunares) e, para bancos temporários
+de tamanho crescente, o tempo e o pico de memória de
+carregar_midias(prefetch=True), que hidrata as árvores completas de
+temporadas e episódios.
+
+Uso: python -m benchmarks.memoria_modelos
+"""
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+from benchmarks.carga_midias import EPISODIOS_POR_TEMPORADA, TEMPORADAS_POR_SERIE, popular
+from catalogo import Catalogo
+from midia import Episodio, EpisodiosColunares, Temporada
+from midia_concreta import Filme, Serie
+
+ESCALAS = (500, 2000)
+OBJETOS_POR_CLASSE = 20000
+
+FABRICAS = {
+    "Episodio": lambda i: Episodio(i + 1, f"Episódio {i}", 45),
+    "Temporada": lambda i: Temporada(i + 1, f"Temporada {i}"),
+    "Filme": lambda i: Filme(f"Filme {i}", "Drama", 2000, 120, ["Ator A"]),
+    "Serie": lambda i: Serie(f"Série {i}", "Drama", 2000, ["Ator A"]),
+}
+
+
+def bytes_por_objeto(fabrica: Callable[[int], object], quantidade: int = OBJETOS_POR_CLASSE) -> float:
+
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    objetos = [fabrica(i) for i in range(quantidade)]
+    depois = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Desconta o próprio array da lista.
+    return (depois - antes - 8 * len(objetos)) / quantidade
+
+
+def bytes_por_episodio(colunar: bool, quantidade: int = OBJETOS_POR_CLASSE) -> float:
+
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    if colunar:
+        episodios = EpisodiosColunares()
+        for i in range(quantidade):
+            episodios.anexar(i + 1, f"Episódio {i}", 45, i + 1)
+    else:
+        episodios = [Episodio(i + 1, f"Episódio {i}", 45, id=i + 1)
+                     for i in range(quantidade)]
+    depois = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (depois - antes) / len(episodios)
+
+
+def medir_hidratacao(db_path: Path, repeticoes: int = 3):
+
+    catalogo = Catalogo(db_path=db_path, carregar=False)
+
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        catalogo.carregar_midias(forcar=True, prefetch=True)
+        melhor = min(melhor, time.perf_counter() - inicio)
+
+    # O pico é medido numa carga separada, pois o tracemalloc deixa a
+    # alocação bem mais lenta.
+    catalogo._definir_midias([])
+    tracemalloc.start()
+    catalogo.carregar_midias(forcar=True, prefetch=True)
+    atual, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    catalogo.fechar_conexao()
+    return melhor, atual, pico
+
+
+def main():
+
+    print(f"{'classe':>10} {'bytes/objeto':>14}")
+    for nome, fabrica in FABRICAS.items():
+        print(f"{nome:>10} {bytes_por_objeto(fabrica):>14.0f}")
+
+    print()
+    print(f"{'episódios em':>14} {'bytes/episódio':>15}")
+    print(f"{'lista':>14} {bytes_por_episodio(False):>15.0f}")
+    print(f"{'colunas':>14} {bytes_por_episodio(True):>15.0f}")
+
+    print()
+    print(f"{'séries':>8} {'episódios':>10} {'tempo (ms)':>12} {'retido (MiB)':>13} {'pico (MiB)':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for num_series in ESCALAS:
+            db_path = Path(tmp) / f"bench_{num_series}.db"
+            popular(db_path, num_series)
+            tempo, atual, pico = medir_hidratacao(db_path)
+            episodios = num_series * TEMPORADAS_POR_SERIE * EPISODIOS_POR_TEMPORADA
+            print(f"{num_series:>8} {episodios:>10} {tempo * 1000:>12.1f} "
+                  f"{atual / 2**20:>13.1f} {pico / 2**20:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Benchmark dos perfis de conexão (PRAGMAs) do Catalogo.
+
+Para cada perfil, popula um banco temporário e mede a vazão de escritas
+pequenas (adicionar_midia e atualizar_midia, um commit cada, dominadas pelo
+fsync) e de leituras (páginas da listagem, estatísticas via SQL e busca).
+
+Uso: python -m benchmarks.perfis_conexao
+"""
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from benchmarks.ingestao_lote import gerar_midias
+from catalogo import Catalogo
+from conexao import PERFIS, PerfilConexao
+from midia import StatusVisualizacao
+from midia_concreta import Filme
+
+PERFIS_MEDIDOS = {
+    "padrao": PERFIS["padrao"],
+    "wal+full": PerfilConexao(journal_mode="WAL", synchronous="FULL"),
+    "producao": PERFIS["producao"],
+}
+TAMANHO_BASE = 5000
+ESCRITAS = 300
+LEITURAS = 2000
+
+
+def por_segundo(operacao: Callable[[int], None], quantidade: int) -> float:
+
+    inicio = time.perf_counter()
+    for i in range(quantidade):
+        operacao(i)
+    return quantidade / (time.perf_counter() - inicio)
+
+
+def medir(db_path: Path, perfil: PerfilConexao):
+
+    catalogo = Catalogo(db_path=db_path, carregar=False, perfil=perfil)
+    catalogo.adicionar_midias_em_lote(gerar_midias(TAMANHO_BASE))
+    catalogo.carregar_midias()
+    aleatorio = random.Random(42)
+
+    insercoes = por_segundo(lambda i: catalogo.adicionar_midia(
+        Filme(f"Novo {i:05d}", "Drama", 2001, 100, ["Ator A"])), ESCRITAS)
+
+    midias = aleatorio.sample(catalogo.midias, ESCRITAS)
+
+    def atualizar(i: int):
+        midia = midias[i]
+        midia.status_visualizacao = StatusVisualizacao.CONCLUIDO
+        midia.avaliacao = aleatorio.uniform(1, 10)
+        catalogo.atualizar_midia(midia)
+
+    atualizacoes = por_segundo(atualizar, ESCRITAS)
+
+    # Leituras pelo SQL, com a lista em memória vazia, como nas ferramentas.
+    leitor = Catalogo(db_path=db_path, carregar=False, perfil=perfil)
+    chaves = leitor.conn.execute("SELECT titulo, id FROM Midia").fetchall()
+    paginas = por_segundo(lambda i: leitor.pagina_midias(
+        20, apos=tuple(aleatorio.choice(chaves))), LEITURAS)
+    estatisticas = por_segundo(lambda i: leitor.obter_estatisticas_gerais(), LEITURAS // 20)
+    buscas = por_segundo(lambda i: leitor.buscar(f"Série {i % 1000:03d}"), LEITURAS // 4)
+
+    leitor.fechar_conexao()
+    catalogo.fechar_conexao()
+    return insercoes, atualizacoes, paginas, estatisticas, buscas
+
+
+def main():
+
+    print(f"{'perfil':>10} {'inserções/s':>12} {'atualizações/s':>15} "
+          f"{'páginas/s':>10} {'estatísticas/s':>15} {'buscas/s':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for nome, perfil in PERFIS_MEDIDOS.items():
+            resultado = medir(Path(tmp) / f"bench_{nome}.db", perfil)
+            insercoes, atualizacoes, paginas, estatisticas, buscas = resultado
+            print(f"{nome:>10} {insercoes:>12.0f} {atualizacoes:>15.0f} "
+                  f"{paginas:>10.0f} {estatisticas:>15.0f} {buscas:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
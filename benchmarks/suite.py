@@ -0,0 +1,234 @@
+"""Suíte de benchmarks do Catalogo em várias escalas, com saída em JSON.
+
+Para cada escala, gera um catálogo sintético (benchmarks.gerador, semente
+fixa) num banco temporário e mede, em milissegundos por operação:
+carregar_midias (completa e com prefetch), obter_estatisticas_gerais (pelo
+agregado em memória e pelo SQL), obter_midias_por_status, adicionar_midia,
+adicionar_episodio_em_temporada e remover_midia. Os resultados, com o
+commit e o ambiente, são gravados num JSON; --comparar confronta dois
+desses arquivos e aponta as operações que ficaram mais lentas.
+
+Uso: python -m benchmarks.suite [--escalas pequena,media] [--semente 42]
+     [--saida resultados.json] [--perfil producao]
+     python -m benchmarks.suite --comparar antes.json depois.json [--tolerancia 0.1]
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.gerador import GeradorCatalogo
+from catalogo import Catalogo
+from conexao import PERFIS
+from midia import Episodio, StatusVisualizacao, TipoMidia
+
+# (filmes, séries) de cada escala.
+ESCALAS = {
+    "pequena": (1000, 100),
+    "media": (10000, 1000),
+    "grande": (100000, 10000),
+}
+ESCALAS_PADRAO = ("pequena", "media")
+REPETICOES_CARGA = 3
+REPETICOES_LEITURA = 50
+ESCRITAS = 200
+
+
+def resumir(tempos: List[float]) -> Dict[str, float]:
+    """Estatísticas de uma lista de tempos em segundos, convertidas para ms."""
+
+    ordenados = sorted(t * 1000 for t in tempos)
+    return {
+        'n': len(ordenados),
+        'media_ms': round(statistics.fmean(ordenados), 4),
+        'p50_ms': round(statistics.median(ordenados), 4),
+        'p95_ms': round(ordenados[min(len(ordenados) - 1, int(len(ordenados) * 0.95))], 4),
+        'min_ms': round(ordenados[0], 4),
+    }
+
+
+def cronometrar(operacao: Callable[[int], Any], vezes: int) -> Dict[str, float]:
+
+    tempos = []
+    # Algumas operações do Catalogo imprimem mensagens para o menu.
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(vezes):
+            inicio = time.perf_counter()
+            operacao(i)
+            tempos.append(time.perf_counter() - inicio)
+    return resumir(tempos)
+
+
+def medir_escala(db_path: Path, num_filmes: int, num_series: int, semente: int,
+                 perfil: str) -> Dict[str, Any]:
+
+    resultado: Dict[str, Any] = {'filmes': num_filmes, 'series': num_series}
+    operacoes: Dict[str, Dict[str, float]] = {}
+
+    catalogo = Catalogo(db_path=db_path, carregar=False, perfil=perfil)
+    inicio = time.perf_counter()
+    catalogo.adicionar_midias_em_lote(GeradorCatalogo(semente).midias(num_filmes, num_series))
+    resultado['populacao_s'] = round(time.perf_counter() - inicio, 3)
+    resultado['episodios'] = catalogo.conn.execute("SELECT COUNT(*) FROM Episodio").fetchone()[0]
+    catalogo.fechar_conexao()
+
+    # Leituras pelo SQL, com o catálogo fora da memória (como as ferramentas).
+    catalogo = Catalogo(db_path=db_path, carregar=False, perfil=perfil)
+    operacoes['obter_estatisticas_gerais_sql'] = cronometrar(
+        lambda i: catalogo.obter_estatisticas_gerais(), max(5, REPETICOES_LEITURA // 10))
+
+    operacoes['carregar_midias'] = cronometrar(
+        lambda i: catalogo.carregar_midias(forcar=True), REPETICOES_CARGA)
+    operacoes['carregar_midias_prefetch'] = cronometrar(
+        lambda i: catalogo.carregar_midias(forcar=True, prefetch=True), REPETICOES_CARGA)
+
+    operacoes['obter_estatisticas_gerais'] = cronometrar(
+        lambda i: catalogo.obter_estatisticas_gerais(), REPETICOES_LEITURA)
+    status = list(StatusVisualizacao)
+    operacoes['obter_midias_por_status'] = cronometrar(
+        lambda i: catalogo.obter_midias_por_status(status[i % len(status)]), REPETICOES_LEITURA)
+
+    # Escritas: novas mídias de outra semente, episódios no fim da última
+    # temporada de séries sorteadas e, por fim, remoções.
+    aleatorio = random.Random(semente)
+    novas = list(GeradorCatalogo(semente + 1).midias(ESCRITAS * 9 // 10, ESCRITAS // 10))
+    operacoes['adicionar_midia'] = cronometrar(
+        lambda i: catalogo.adicionar_midia(novas[i]), len(novas))
+
+    # Os alvos são escolhidos (e as árvores carregadas) fora da medição.
+    series = sorted(catalogo.obter_midias_por_tipo(TipoMidia.SERIE), key=lambda m: m._id)
+    proximos: Dict[tuple, int] = {}
+    alvos = []
+    for _ in range(ESCRITAS):
+        serie = aleatorio.choice(series)
+        temporada = serie.temporadas[-1]
+        chave = (serie._id, temporada.numero)
+        numero = proximos.get(chave) or max(e.numero for e in temporada.episodios) + 1
+        proximos[chave] = numero + 1
+        alvos.append((serie._id, temporada.numero, numero))
+
+    operacoes['adicionar_episodio_em_temporada'] = cronometrar(
+        lambda i: catalogo.adicionar_episodio_em_temporada(
+            alvos[i][0], alvos[i][1], Episodio(alvos[i][2], f"Extra {i}", 40)), ESCRITAS)
+
+    ids = aleatorio.sample(sorted(catalogo._por_id), ESCRITAS)
+    operacoes['remover_midia'] = cronometrar(lambda i: catalogo.remover_midia(ids[i]), ESCRITAS)
+
+    divergencias = catalogo.verificar_agregado()
+    if divergencias:
+        raise RuntimeError(f"Agregado inconsistente após o benchmark: {divergencias}")
+    catalogo.fechar_conexao()
+
+    resultado['operacoes'] = operacoes
+    return resultado
+
+
+def _commit() -> Optional[str]:
+
+    try:
+        saida = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                               text=True, check=True, cwd=Path(__file__).resolve().parent)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return saida.stdout.strip() or None
+
+
+def executar(escalas: List[str], semente: int, perfil: str) -> Dict[str, Any]:
+
+    resultados: Dict[str, Any] = {
+        'meta': {
+            'commit': _commit(),
+            'data': datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'plataforma': platform.platform(),
+            'semente': semente,
+            'perfil': perfil,
+        },
+        'escalas': {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for nome in escalas:
+            num_filmes, num_series = ESCALAS[nome]
+            print(f"Escala {nome}: {num_filmes} filmes, {num_series} séries...", file=sys.stderr)
+            resultado = medir_escala(Path(tmp) / f"{nome}.db", num_filmes, num_series, semente, perfil)
+            resultados['escalas'][nome] = resultado
+            imprimir_escala(nome, resultado)
+    return resultados
+
+
+def imprimir_escala(nome: str, resultado: Dict[str, Any]):
+
+    print(f"\n{nome}: {resultado['filmes']} filmes, {resultado['series']} séries, "
+          f"{resultado['episodios']} episódios (populado em {resultado['populacao_s']:.1f}s)")
+    print(f"{'operação':>34} {'p50 (ms)':>10} {'p95 (ms)':>10} {'média (ms)':>11}")
+    for operacao, tempos in resultado['operacoes'].items():
+        print(f"{operacao:>34} {tempos['p50_ms']:>10.3f} {tempos['p95_ms']:>10.3f} "
+              f"{tempos['media_ms']:>11.3f}")
+
+
+def comparar(antes: Dict[str, Any], depois: Dict[str, Any], tolerancia: float = 0.1) -> int:
+    """Compara os p50 de dois resultados; retorna quantas operações pioraram além da tolerância."""
+
+    print(f"{'antes':>10}: {antes['meta'].get('commit')}  {'depois':>8}: {depois['meta'].get('commit')}")
+    print(f"{'escala':>8} {'operação':>34} {'antes (ms)':>11} {'depois (ms)':>12} {'razão':>7}")
+    regressoes = 0
+    for escala, resultado in depois['escalas'].items():
+        anteriores = antes['escalas'].get(escala, {}).get('operacoes', {})
+        for operacao, tempos in resultado['operacoes'].items():
+            if operacao not in anteriores:
+                continue
+            p50_antes = anteriores[operacao]['p50_ms']
+            razao = tempos['p50_ms'] / p50_antes if p50_antes else float("inf")
+            marca = ""
+            if razao > 1 + tolerancia:
+                marca = "  REGRESSÃO"
+                regressoes += 1
+            print(f"{escala:>8} {operacao:>34} {p50_antes:>11.3f} {tempos['p50_ms']:>12.3f} "
+                  f"{razao:>6.2f}x{marca}")
+    return regressoes
+
+
+def main(argv: Optional[List[str]] = None):
+
+    parser = argparse.ArgumentParser(description="Suíte de benchmarks do Catalogo.")
+    parser.add_argument("--escalas", default=",".join(ESCALAS_PADRAO),
+                        help=f"escalas separadas por vírgula ({', '.join(ESCALAS)})")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--perfil", choices=sorted(PERFIS), default="producao")
+    parser.add_argument("--saida", type=Path,
+                        help="arquivo JSON de resultados (padrão: benchmark_<commit>.json)")
+    parser.add_argument("--comparar", nargs=2, type=Path, metavar=("ANTES", "DEPOIS"))
+    parser.add_argument("--tolerancia", type=float, default=0.1,
+                        help="aumento relativo do p50 tolerado em --comparar")
+    args = parser.parse_args(argv)
+
+    if args.comparar:
+        antes, depois = (json.loads(caminho.read_text(encoding="utf-8")) for caminho in args.comparar)
+        return 1 if comparar(antes, depois, args.tolerancia) else 0
+
+    escalas = [e.strip() for e in args.escalas.split(",") if e.strip()]
+    desconhecidas = [e for e in escalas if e not in ESCALAS]
+    if desconhecidas:
+        parser.error(f"escalas desconhecidas: {', '.join(desconhecidas)}")
+
+    resultados = executar(escalas, args.semente, args.perfil)
+    saida = args.saida or Path(f"benchmark_{resultados['meta']['commit'] or 'local'}.json")
+    saida.write_text(json.dumps(resultados, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\nResultados gravados em {saida}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,134 +1,596 @@
+import bisect
+import re
 import sqlite3
-from typing import List, Optional, Dict, Any, Union
-from midia import Midia, TipoMidia, StatusVisualizacao, Temporada, Episodio
+import threading
+from typing import Iterable, Iterator, List, Optional, Dict, Any, Set, Tuple, Union
+from midia import Midia, TipoMidia, StatusVisualizacao, Temporada, Episodio, EpisodiosColunares
 from midia_concreta import Filme, Serie
+from migracoes import aplicar_migracoes
+from conexao import PerfilConexao, obter_perfil
+from concorrencia import TravaLeituraEscrita, com_escrita, com_leitura
+from estatisticas import calcular_estatisticas
+from ranking import decadas_avaliadas, generos_avaliados, ids_ranking
+from paginacao import Chave, Pagina, ids_pagina
 from pathlib import Path
 
 
+# Acima desse número de mídias alteradas (ou de 1/4 do catálogo), a recarga
+# incremental deixa de compensar e o grafo é relido por inteiro.
+LIMITE_RECARGA_INCREMENTAL = 256
+# Quantidade de entradas mantidas no log de alterações; a poda só roda quando
+# o excedente passa de INTERVALO_PODA_ALTERACOES, para não custar um DELETE por escrita.
+LIMITE_LOG_ALTERACOES = 10000
+INTERVALO_PODA_ALTERACOES = 1000
+# Colunas lidas de Midia para hidratar um Filme/Serie (o elenco vem de MidiaAtor).
+# Para séries, duracao_minutos e os totais são mantidos pelos triggers da migração 8.
+COLUNAS_MIDIA = ("id, titulo, genero, ano_lancamento, duracao_minutos, tipo_midia, "
+                 "status_visualizacao, avaliacao, total_temporadas, total_episodios")
+
+# Tamanho máximo das listas de parâmetros em cláusulas IN.
+TAMANHO_BLOCO_SQL = 500
+# Temporadas com pelo menos esse número de episódios são carregadas no formato
+# colunar (EpisodiosColunares), sem um objeto Episodio por linha.
+LIMITE_EPISODIOS_COLUNAR = 100
+# Termos mais curtos que isso são ignorados na busca: o índice de prefixos
+# (prefix = '2 3') não os atende, e eles casariam com quase todo o catálogo.
+TAMANHO_MINIMO_TERMO = 2
+
+
+def _chave_titulo(midia: Midia) -> str:
+    return midia.titulo
+
+
+def _consulta_fts(texto: str) -> str:
+    """Converte o texto digitado numa consulta FTS5 de prefixos (todos os termos)."""
+
+    termos = [t for t in re.split(r"[^\w]+", texto) if len(t) >= TAMANHO_MINIMO_TERMO]
+    return " ".join(f'"{termo}"*' for termo in termos)
+
+
+def _em_blocos(valores: Iterable, tamanho: int = TAMANHO_BLOCO_SQL):
+
+    bloco: list = []
+    for valor in valores:
+        bloco.append(valor)
+        if len(bloco) == tamanho:
+            yield bloco
+            bloco = []
+    if bloco:
+        yield bloco
+
+
+def _descartar_ids(midias: Iterable[Midia]):
+
+    # Ids atribuídos numa transação desfeita deixam de valer.
+    for midia in midias:
+        midia._id = None
+        for temporada in getattr(midia, "temporadas", []):
+            temporada._id = None
+            for episodio in temporada.episodios:
+                episodio._id = None
+
+
 class Catalogo:
-    def __init__(self, db_path: Path = Path("dados.db")):
+    def __init__(self, db_path: Path = Path("dados.db"), carregar: bool = True,
+                 perfil: Union[str, PerfilConexao, None] = None, concorrente: bool = False):
         self.db_path = db_path
+        # Ajustes de PRAGMA da conexão ("padrao", "producao" ou um PerfilConexao).
+        # O modo concorrente depende do WAL e por isso usa "producao" por padrão.
+        if concorrente and perfil is None:
+            perfil = "producao"
+        self.perfil = obter_perfil(perfil)
+        if concorrente:
+            if self.perfil.journal_mode != "WAL":
+                raise ValueError("O modo concorrente exige um perfil com journal_mode WAL.")
+            if str(db_path) == ":memory:":
+                raise ValueError("O modo concorrente exige um banco em arquivo.")
+
+        # Modo concorrente (thread-safe): as escritas passam por uma única
+        # conexão, serializadas pela trava de escrita; cada thread leitora usa
+        # sua própria conexão somente leitura, e os índices em memória ficam
+        # protegidos por uma trava de leitores e escritor. Fora desse modo,
+        # _trava é None e nada é travado.
+        self._trava: Optional[TravaLeituraEscrita] = TravaLeituraEscrita() if concorrente else None
+        self._leitores = threading.local()
+        self._conexoes_leitura: List[sqlite3.Connection] = []
+        self._trava_conexoes = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._cursor: Optional[sqlite3.Cursor] = None
         self._midias: List[Midia] = []
+        # Índice id -> Midia. Remoções tiram a mídia só do índice; a lista
+        # ordenada é compactada de uma vez no próximo acesso.
+        self._por_id: Dict[int, Midia] = {}
+        self._remocoes_pendentes = False
+        # Índices secundários (conjuntos de ids), mantidos a cada escrita.
+        self._por_status: Dict[StatusVisualizacao, Set[int]] = {
+            s: set() for s in StatusVisualizacao}
+        self._por_tipo: Dict[TipoMidia, Set[int]] = {
+            t: set() for t in TipoMidia}
+        self._por_genero: Dict[str, Dict[TipoMidia, Set[int]]] = {}
+        # Agregado das estatísticas, atualizado por deltas a cada escrita. A
+        # contribuição (avaliação, minutos concluídos) de cada mídia é guardada
+        # para poder ser descontada quando ela muda.
+        self._soma_avaliacoes = 0.0
+        self._minutos_concluidos = 0
+        self._contribuicoes: Dict[int, Tuple[float, int]] = {}
+
+        # Controle de versão dos dados: PRAGMA data_version muda quando outra
+        # conexão grava no banco; o contador registra as escritas desta instância.
+        self._contador_escritas = 0
+        self._versao_carregada: Optional[int] = None
+        self._ultima_alteracao = 0
+        self._alteracoes_podadas = 0
 
         try:
-            self.conn = sqlite3.connect(str(self.db_path))
-            self.cursor = self.conn.cursor()
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=not concorrente)
+            self.perfil.aplicar(self._conn)
+            self._cursor = self._conn.cursor()
         except Exception as e:
             print(f"ERRO CRÍTICO NA CONEXÃO: {e}")
-            self.conn = None
-            self.cursor = None
+            self._conn = None
+            self._cursor = None
             return
 
         self.inicializar_db()
-        self.carregar_midias()
+        # Com carregar=False (ferramentas de importação/exportação), a lista em
+        # memória só é montada na primeira chamada a carregar_midias.
+        if carregar:
+            self.carregar_midias()
+
+    @property
+    def conn(self) -> Optional[sqlite3.Connection]:
+        """Conexão da thread atual: a de escrita, ou a de leitura no modo concorrente."""
+        if self._trava is None or self._conn is None or self._trava.escrevendo():
+            return self._conn
+        return self._leitor()[0]
+
+    @property
+    def cursor(self) -> Optional[sqlite3.Cursor]:
+        if self._trava is None or self._conn is None or self._trava.escrevendo():
+            return self._cursor
+        return self._leitor()[1]
+
+    def _leitor(self) -> Tuple[sqlite3.Connection, sqlite3.Cursor]:
+
+        leitor = getattr(self._leitores, "leitor", None)
+        if leitor is None:
+            # Somente leitura: uma escrita fora da trava falha em vez de
+            # disputar o banco com a conexão de escrita. O journal_mode é do
+            # arquivo e já foi definido por ela.
+            conn = sqlite3.connect(f"{Path(self.db_path).resolve().as_uri()}?mode=ro",
+                                   uri=True, check_same_thread=False)
+            perfil = PerfilConexao(**{**vars(self.perfil), "journal_mode": None})
+            perfil.aplicar(conn)
+            leitor = self._leitores.leitor = (conn, conn.cursor())
+            with self._trava_conexoes:
+                self._conexoes_leitura.append(conn)
+        return leitor
 
     @property
     def midias(self):
-        return self._midias
+        if self._trava is None:
+            if self._remocoes_pendentes:
+                self._compactar_midias()
+            return self._midias
+        # No modo concorrente, uma cópia: a lista pode mudar enquanto a
+        # thread que a pediu ainda a percorre. Quem já está lendo não pode
+        # compactar (exigiria a escrita) e recebe a lista filtrada.
+        trava = self._trava
+        if self._remocoes_pendentes and not trava.lendo():
+            with trava.escrita():
+                if self._remocoes_pendentes:
+                    self._compactar_midias()
+        with trava.leitura():
+            if self._remocoes_pendentes:
+                por_id = self._por_id
+                return [m for m in self._midias if por_id.get(m._id) is m]
+            return list(self._midias)
+
+    def _compactar_midias(self):
+
+        por_id = self._por_id
+        self._midias = [m for m in self._midias if por_id.get(m._id) is m]
+        self._remocoes_pendentes = False
+
+    def _definir_midias(self, midias: List[Midia]):
+
+        self._midias = midias
+        self._por_id = {}
+        self._por_status = {s: set() for s in StatusVisualizacao}
+        self._por_tipo = {t: set() for t in TipoMidia}
+        self._por_genero = {}
+        self._soma_avaliacoes = 0.0
+        self._minutos_concluidos = 0
+        self._contribuicoes = {}
+        self._remocoes_pendentes = False
+        for midia in midias:
+            self._indexar(midia)
+
+    def _indexar(self, midia: Midia):
+
+        midia_id = midia._id
+        self._por_id[midia_id] = midia
+        self._por_status[midia.status_visualizacao].add(midia_id)
+        self._por_tipo[midia.tipo].add(midia_id)
+        por_tipo = self._por_genero.get(midia.genero)
+        if por_tipo is None:
+            por_tipo = self._por_genero[midia.genero] = {
+                t: set() for t in TipoMidia}
+        por_tipo[midia.tipo].add(midia_id)
+        self._aplicar_contribuicao(midia)
+
+    def _desindexar(self, midia_id: int) -> Optional[Midia]:
+
+        midia = self._por_id.pop(midia_id, None)
+        if midia is None:
+            return None
+        for ids in self._por_status.values():
+            ids.discard(midia_id)
+        self._por_tipo[midia.tipo].discard(midia_id)
+        por_tipo = self._por_genero.get(midia.genero)
+        if por_tipo is not None:
+            por_tipo[midia.tipo].discard(midia_id)
+            if not any(por_tipo.values()):
+                del self._por_genero[midia.genero]
+        self._descontar_contribuicao(midia_id)
+        self._remocoes_pendentes = True
+        return midia
+
+    def _aplicar_contribuicao(self, midia: Midia):
+
+        minutos = 0
+        if midia.status_visualizacao == StatusVisualizacao.CONCLUIDO:
+            if midia.tipo == TipoMidia.FILME:
+                minutos = midia.duracao_minutos
+            elif midia.tipo == TipoMidia.SERIE:
+                minutos = midia.duracao_total
+        self._soma_avaliacoes += midia.avaliacao
+        self._minutos_concluidos += minutos
+        self._contribuicoes[midia._id] = (midia.avaliacao, minutos)
+
+    def _descontar_contribuicao(self, midia_id: int):
+
+        avaliacao, minutos = self._contribuicoes.pop(midia_id, (0.0, 0))
+        self._soma_avaliacoes -= avaliacao
+        self._minutos_concluidos -= minutos
+
+    def _ordenar_por_titulo(self, ids: Iterable[int]) -> List[Midia]:
+
+        por_id = self._por_id
+        return sorted((por_id[i] for i in ids), key=_chave_titulo)
 
+    @property
+    def versao_dados(self) -> Tuple[int, int]:
+        """Par (data_version do SQLite, escritas locais) que muda a cada alteração."""
+        return (self._data_version(), self._contador_escritas)
+
+    def _data_version(self) -> int:
+
+        # Sempre a conexão de escrita: o data_version é por conexão, e a
+        # versão precisa ser a mesma para todas as threads.
+        if not self._conn:
+            return 0
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    @com_escrita
     def fechar_conexao(self):
 
-        if getattr(self, "conn", None):
-            self.conn.close()
+        with self._trava_conexoes:
+            for conn in self._conexoes_leitura:
+                conn.close()
+            self._conexoes_leitura.clear()
+        self._leitores = threading.local()
+        if getattr(self, "_conn", None):
+            self._conn.close()
 
+    @com_escrita
     def inicializar_db(self):
 
         if not self.conn:
             return
 
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS Midia (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                titulo TEXT NOT NULL,
-                genero TEXT,
-                ano_lancamento INTEGER,
-                elenco TEXT,
-                duracao_minutos INTEGER DEFAULT 0,
-                tipo_midia TEXT NOT NULL,
-                status_visualizacao TEXT NOT NULL,
-                avaliacao REAL DEFAULT 0.0
-            );
-        """)
+        aplicar_migracoes(self.conn)
+        # Depois das migrações, que recriam tabelas com a verificação desligada.
+        self.conn.execute("PRAGMA foreign_keys = ON")
 
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS Temporada (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                serie_id INTEGER,
-                numero INTEGER NOT NULL,
-                nome TEXT,
-                FOREIGN KEY (serie_id) REFERENCES Midia (id)
-            );
-        """)
+    def carregar_midias(self, forcar: bool = False, prefetch: bool = False):
 
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS Episodio (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                temporada_id INTEGER,
-                numero INTEGER NOT NULL,
-                nome TEXT,
-                duracao_minutos INTEGER,
-                FOREIGN KEY (temporada_id) REFERENCES Temporada (id)
-            );
-        """)
-        self.conn.commit()
+        # Caminho rápido sem a trava de escrita, para que as leituras do modo
+        # concorrente não se serializem aqui quando nada mudou.
+        if (not forcar and not prefetch and self._versao_carregada is not None
+                and self._data_version() == self._versao_carregada):
+            return
+        self._carregar_midias(forcar, prefetch)
 
-    def carregar_midias(self):
+    @com_escrita
+    def _carregar_midias(self, forcar: bool, prefetch: bool):
 
         if not self.conn:
-            self._midias = []
+            self._definir_midias([])
             return
 
-        self._midias = []
+        self._sincronizar_midias(forcar)
+        if prefetch:
+            self.pre_carregar_temporadas()
 
-        filmes_db = self.cursor.execute(
-            "SELECT id, titulo, genero, ano_lancamento, elenco, duracao_minutos, status_visualizacao, avaliacao FROM Midia WHERE tipo_midia = 'FILME'"
-        ).fetchall()
+    def _sincronizar_midias(self, forcar: bool):
 
-        for id_midia, titulo, genero, ano, elenco_str, duracao, status_nome, avaliacao in filmes_db:
-            elenco = [ator.strip()
-                      for ator in (elenco_str or "").split(',') if ator.strip()]
-            status = StatusVisualizacao[status_nome]
-            midia = Filme(titulo, genero, ano, duracao, elenco,
-                          status=status, avaliacao=avaliacao)
-            midia._id = id_midia
-            self._midias.append(midia)
+        data_version = self._data_version()
 
-        series_db = self.cursor.execute(
-            "SELECT id, titulo, genero, ano_lancamento, elenco, status_visualizacao, avaliacao FROM Midia WHERE tipo_midia = 'SERIE'"
-        ).fetchall()
+        if not forcar and self._versao_carregada is not None:
+            # As escritas desta instância já atualizam _midias; só alterações
+            # feitas por outras conexões mudam o data_version.
+            if data_version == self._versao_carregada:
+                return
 
-        for id_midia, titulo, genero, ano, elenco_str, status_nome, avaliacao in series_db:
-            elenco = [ator.strip()
-                      for ator in (elenco_str or "").split(',') if ator.strip()]
-            status = StatusVisualizacao[status_nome]
-            serie = Serie(titulo, genero, ano, elenco,
-                          status=status, avaliacao=avaliacao)
-            serie._id = id_midia
+            alteradas = self._midias_alteradas()
+            if alteradas is not None and len(alteradas) <= max(
+                    LIMITE_RECARGA_INCREMENTAL, len(self._por_id) // 4):
+                self._recarregar_midias(alteradas)
+                self._versao_carregada = data_version
+                self._podar_alteracoes(self._ultima_alteracao)
+                return
+
+        self._ultima_alteracao = self._seq_alteracoes()
+
+        midias = self._carregar_grafo()
+        midias.sort(key=_chave_titulo)
+        self._definir_midias(midias)
+        self._versao_carregada = data_version
+
+        self._podar_alteracoes(self._ultima_alteracao)
 
+    def _carregar_grafo(self, midia_ids: Optional[Iterable[int]] = None) -> List[Midia]:
+
+        # Duas consultas fixas (Midia e MidiaAtor), independente do número de
+        # séries; o grafo é montado em memória numa única passada. Com
+        # midia_ids, as consultas são restritas a esse conjunto.
+        if midia_ids is None:
+            midias_db = self.cursor.execute(
+                f"SELECT {COLUNAS_MIDIA} FROM Midia ORDER BY tipo_midia, id"
+            ).fetchall()
+            elencos_db = self.cursor.execute("""
+                SELECT ma.midia_id, a.nome FROM MidiaAtor ma JOIN Ator a ON a.id = ma.ator_id
+                ORDER BY ma.midia_id, ma.ordem
+            """).fetchall()
+        else:
+            midias_db = []
+            elencos_db = []
+            for bloco in _em_blocos(midia_ids):
+                marcadores = ",".join("?" * len(bloco))
+                midias_db.extend(self.cursor.execute(
+                    f"SELECT {COLUNAS_MIDIA} FROM Midia WHERE id IN ({marcadores}) ORDER BY tipo_midia, id", bloco
+                ).fetchall())
+                elencos_db.extend(self.cursor.execute(f"""
+                    SELECT ma.midia_id, a.nome FROM MidiaAtor ma JOIN Ator a ON a.id = ma.ator_id
+                    WHERE ma.midia_id IN ({marcadores})
+                    ORDER BY ma.midia_id, ma.ordem
+                """, bloco).fetchall())
+
+        midias: List[Midia] = []
+        por_id: Dict[int, Midia] = {}
+        for row in midias_db:
+            midia = self._hidratar_midia(row)
+            if isinstance(midia, Serie):
+                # As temporadas não são lidas aqui: a série recebe só os totais
+                # desnormalizados e carrega a árvore no primeiro acesso.
+                midia.definir_carregamento_tardio(
+                    self._carregar_temporadas_da_serie, (row[8], row[9], row[4] or 0))
+            por_id[midia._id] = midia
+            midias.append(midia)
+
+        for midia_id, nome in elencos_db:
+            midia = por_id.get(midia_id)
+            if midia is not None:
+                midia.elenco.append(nome)
+
+        return midias
+
+    def _carregar_temporadas_da_serie(self, serie: Serie):
+
+        self._carregar_temporadas_em_lote({serie._id: serie})
+
+    @com_escrita
+    def pre_carregar_temporadas(self, midias: Optional[Iterable[Midia]] = None):
+        """Carrega de uma vez as árvores de temporadas das séries ainda não carregadas.
+
+        Sem argumento, vale para todas as séries do catálogo em memória. Usado
+        por telas que exibem a árvore completa, evitando uma consulta por série.
+        """
+
+        if not self.conn:
+            return
+
+        todas = midias is None
+        candidatas = self.midias if todas else midias
+        series = {m._id: m for m in candidatas
+                  if isinstance(m, Serie) and not m.temporadas_carregadas}
+        if series:
+            self._carregar_temporadas_em_lote(series, todas)
+
+    def _carregar_temporadas_em_lote(self, series: Dict[int, Serie], todas: bool = False):
+
+        # Duas consultas para qualquer quantidade de séries; com todas=True,
+        # as tabelas são lidas sem filtro.
+        if todas:
             temporadas_db = self.cursor.execute(
-                "SELECT id, numero, nome FROM Temporada WHERE serie_id = ?", (
-                    id_midia,)
+                "SELECT id, serie_id, numero, nome, total_episodios FROM Temporada ORDER BY serie_id, numero, id"
             ).fetchall()
+            episodios_db = self.cursor.execute(
+                "SELECT id, temporada_id, numero, nome, duracao_minutos FROM Episodio ORDER BY temporada_id, id"
+            ).fetchall()
+        else:
+            temporadas_db = []
+            episodios_db = []
+            for bloco in _em_blocos(series):
+                marcadores = ",".join("?" * len(bloco))
+                temporadas_db.extend(self.cursor.execute(
+                    f"SELECT id, serie_id, numero, nome, total_episodios FROM Temporada WHERE serie_id IN ({marcadores}) ORDER BY serie_id, numero, id", bloco
+                ).fetchall())
+                episodios_db.extend(self.cursor.execute(
+                    f"SELECT id, temporada_id, numero, nome, duracao_minutos FROM Episodio WHERE temporada_id IN (SELECT id FROM Temporada WHERE serie_id IN ({marcadores})) ORDER BY temporada_id, id", bloco
+                ).fetchall())
+
+        arvores: Dict[int, List[Temporada]] = {serie_id: [] for serie_id in series}
+        temporadas: Dict[int, Temporada] = {}
+        for id_temp, serie_id, num_temp, nome_temp, total_ep in temporadas_db:
+            lista = arvores.get(serie_id)
+            if lista is None:
+                continue
+            temp_obj = Temporada(num_temp, nome_temp, id=id_temp,
+                                 colunar=total_ep >= LIMITE_EPISODIOS_COLUNAR)
+            lista.append(temp_obj)
+            temporadas[id_temp] = temp_obj
+
+        for id_ep, temporada_id, num_ep, nome_ep, duracao_ep in episodios_db:
+            temp_obj = temporadas.get(temporada_id)
+            if temp_obj is None:
+                continue
+            # O índice único (temporada_id, numero) já garante que não há
+            # números repetidos; dispensa a verificação de adicionar_episodio.
+            if isinstance(temp_obj.episodios, EpisodiosColunares):
+                temp_obj.episodios.anexar(num_ep, nome_ep, duracao_ep, id_ep)
+            else:
+                temp_obj.episodios.append(Episodio(num_ep, nome_ep, duracao_ep, id=id_ep))
+
+        for serie_id, serie in series.items():
+            serie.temporadas = arvores[serie_id]
+
+    def iterar_midias(self) -> Iterator[Midia]:
+        """Percorre o banco em ordem de id, montando uma mídia por vez.
+
+        Não usa nem altera a lista em memória: Midia, MidiaAtor, Temporada e
+        Episodio são lidos por cursores na mesma ordem de mídia e intercalados,
+        de modo que só a mídia corrente (com sua árvore) fica em memória.
+        """
+
+        if not self.conn:
+            return
+
+        midias_db = self.conn.execute(
+            f"SELECT {COLUNAS_MIDIA} FROM Midia ORDER BY id")
+        elencos_db = self.conn.execute("""
+            SELECT ma.midia_id, a.nome FROM MidiaAtor ma JOIN Ator a ON a.id = ma.ator_id
+            ORDER BY ma.midia_id, ma.ordem
+        """)
+        temporadas_db = self.conn.execute(
+            "SELECT serie_id, id, numero, nome, total_episodios FROM Temporada ORDER BY serie_id, id")
+        episodios_db = self.conn.execute("""
+            SELECT t.serie_id, e.temporada_id, e.id, e.numero, e.nome, e.duracao_minutos
+            FROM Episodio e JOIN Temporada t ON t.id = e.temporada_id
+            ORDER BY t.serie_id, t.id, e.numero
+        """)
 
-            for id_temp, num_temp, nome_temp in temporadas_db:
-                temp_obj = Temporada(num_temp, nome_temp)
-                temp_obj._id = id_temp
+        elenco_row = elencos_db.fetchone()
+        temporada_row = temporadas_db.fetchone()
+        episodio_row = episodios_db.fetchone()
+
+        for row in midias_db:
+            midia = self._hidratar_midia(row)
+            midia_id = midia._id
+
+            while elenco_row is not None and elenco_row[0] < midia_id:
+                elenco_row = elencos_db.fetchone()
+            while elenco_row is not None and elenco_row[0] == midia_id:
+                midia.elenco.append(elenco_row[1])
+                elenco_row = elencos_db.fetchone()
+
+            # Descarta temporadas e episódios de séries anteriores (órfãos).
+            while temporada_row is not None and (temporada_row[0] is None or temporada_row[0] < midia_id):
+                temporada_row = temporadas_db.fetchone()
+            while episodio_row is not None and (episodio_row[0] is None or episodio_row[0] < midia_id):
+                episodio_row = episodios_db.fetchone()
+
+            while temporada_row is not None and temporada_row[0] == midia_id:
+                _, id_temp, num_temp, nome_temp, total_ep = temporada_row
+                temp_obj = Temporada(num_temp, nome_temp, id=id_temp,
+                                     colunar=total_ep >= LIMITE_EPISODIOS_COLUNAR)
+                while episodio_row is not None and episodio_row[0] == midia_id and episodio_row[1] == id_temp:
+                    _, _, id_ep, num_ep, nome_ep, duracao_ep = episodio_row
+                    temp_obj.adicionar_episodio(
+                        Episodio(num_ep, nome_ep, duracao_ep, id=id_ep))
+                    episodio_row = episodios_db.fetchone()
+                if isinstance(midia, Serie):
+                    midia.adicionar_temporada(temp_obj)
+                temporada_row = temporadas_db.fetchone()
+
+            yield midia
+
+    def _recarregar_midias(self, midia_ids: Set[int]):
+
+        if not midia_ids:
+            return
+
+        # Custo proporcional às mídias alteradas: as versões antigas saem dos
+        # índices e ficam na lista até a compactação preguiçosa; ids que não
+        # existem mais no banco só são desindexados.
+        atualizadas = self._carregar_grafo(midia_ids)
+        for midia_id in midia_ids:
+            self._desindexar(midia_id)
+        for midia in atualizadas:
+            bisect.insort(self._midias, midia, key=_chave_titulo)
+            self._indexar(midia)
+
+    def _seq_alteracoes(self) -> int:
+
+        row = self.cursor.execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = 'Alteracao'").fetchone()
+        return row[0] if row else 0
+
+    def _midias_alteradas(self) -> Optional[Set[int]]:
+        """Ids alterados desde a última leitura do log, ou None se o log tiver lacunas."""
+
+        seq_atual = self._seq_alteracoes()
+        rows = self.cursor.execute(
+            "SELECT seq, midia_id FROM Alteracao WHERE seq > ? AND seq <= ?",
+            (self._ultima_alteracao, seq_atual)
+        ).fetchall()
 
-                episodios_db = self.cursor.execute(
-                    "SELECT numero, nome, duracao_minutos FROM Episodio WHERE temporada_id = ?", (
-                        id_temp,)
-                ).fetchall()
+        # Entradas podadas por outra conexão antes de serem lidas aqui.
+        if len(rows) != seq_atual - self._ultima_alteracao:
+            return None
 
-                for num_ep, nome_ep, duracao_ep in episodios_db:
-                    ep_obj = Episodio(num_ep, nome_ep, duracao_ep)
-                    temp_obj.adicionar_episodio(ep_obj)
+        self._ultima_alteracao = seq_atual
+        return {midia_id for _, midia_id in rows if midia_id is not None}
 
-                serie.temporadas.append(temp_obj)
+    def _podar_alteracoes(self, seq_atual: int):
 
-            self._midias.append(serie)
+        # Relativo ao fim do log, e não ao cursor desta instância: quem não
+        # carrega o catálogo (importador, exportador) também precisa podar.
+        limite = seq_atual - LIMITE_LOG_ALTERACOES
+        if limite - self._alteracoes_podadas < INTERVALO_PODA_ALTERACOES:
+            return
+        self.cursor.execute("DELETE FROM Alteracao WHERE seq <= ?", (limite,))
+        self.conn.commit()
+        self._alteracoes_podadas = limite
 
-        self._midias.sort(key=lambda m: m.titulo)
+    def _registrar_escrita(self):
 
+        # Chamado após cada commit desta instância. Se nenhuma outra conexão
+        # gravou desde a última sincronização (data_version igual ao carregado),
+        # as entradas novas do log são todas nossas e o cursor pode avançar;
+        # senão ele fica onde está e a próxima sincronização lê as externas.
+        self._contador_escritas += 1
+        seq_atual = self._seq_alteracoes()
+        if self._versao_carregada is not None and self._data_version() == self._versao_carregada:
+            self._ultima_alteracao = seq_atual
+        self._podar_alteracoes(seq_atual)
+
+    def _hidratar_midia(self, row) -> Midia:
+
+        id_midia, titulo, genero, ano, duracao, tipo_nome, status_nome, avaliacao = row[:8]
+        status = StatusVisualizacao[status_nome]
+
+        if tipo_nome == TipoMidia.FILME.name:
+            midia = Filme(titulo, genero, ano, duracao, [],
+                          status=status, avaliacao=avaliacao)
+        else:
+            midia = Serie(titulo, genero, ano, [],
+                          status=status, avaliacao=avaliacao)
+        midia._id = id_midia
+        return midia
+
+    @com_escrita
     def adicionar_midia(self, midia: Midia):
 
         if not self.conn:
@@ -136,36 +598,206 @@ class Catalogo:
 
         elenco_db = ",".join(midia.elenco) if midia.elenco else ""
 
-        if midia.tipo == TipoMidia.FILME:
-            self.cursor.execute("""
-                INSERT INTO Midia (titulo, genero, ano_lancamento, elenco, duracao_minutos, tipo_midia, status_visualizacao, avaliacao)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (midia.titulo, midia.genero, midia.ano_lancamento, elenco_db, midia.duracao_minutos, midia.tipo.name, midia.status_visualizacao.name, midia.avaliacao))
-            midia._id = self.cursor.lastrowid
+        # O índice único (temporada_id, numero) rejeitaria o episódio só no
+        # meio da gravação; a validação vem antes de qualquer INSERT.
+        if isinstance(midia, Serie):
+            for temporada in midia.temporadas:
+                numeros: Set[int] = set()
+                for episodio in temporada.episodios:
+                    if episodio.numero in numeros:
+                        raise ValueError(
+                            f"O episódio número {episodio.numero} está repetido na T{temporada.numero}.")
+                    numeros.add(episodio.numero)
 
-        elif midia.tipo == TipoMidia.SERIE:
-            self.cursor.execute("""
-                INSERT INTO Midia (titulo, genero, ano_lancamento, elenco, tipo_midia, status_visualizacao, avaliacao)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (midia.titulo, midia.genero, midia.ano_lancamento, elenco_db, midia.tipo.name, midia.status_visualizacao.name, midia.avaliacao))
-            midia._id = self.cursor.lastrowid
+        if self.conn.in_transaction:
+            self.conn.commit()
+        try:
+            self.cursor.execute("BEGIN IMMEDIATE")
+            if midia.tipo == TipoMidia.FILME:
+                self.cursor.execute("""
+                    INSERT INTO Midia (titulo, genero, ano_lancamento, elenco, duracao_minutos, tipo_midia, status_visualizacao, avaliacao)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, (midia.titulo, midia.genero, midia.ano_lancamento, elenco_db, midia.duracao_minutos, midia.tipo.name, midia.status_visualizacao.name, midia.avaliacao))
+                midia._id = self.cursor.lastrowid
 
-            for temporada in midia.temporadas:
+            elif midia.tipo == TipoMidia.SERIE:
                 self.cursor.execute("""
-                    INSERT INTO Temporada (serie_id, numero, nome)
-                    VALUES (?, ?, ?)
-                """, (midia._id, temporada.numero, temporada.titulo))
-                temporada._id = self.cursor.lastrowid
+                    INSERT INTO Midia (titulo, genero, ano_lancamento, elenco, tipo_midia, status_visualizacao, avaliacao)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, (midia.titulo, midia.genero, midia.ano_lancamento, elenco_db, midia.tipo.name, midia.status_visualizacao.name, midia.avaliacao))
+                midia._id = self.cursor.lastrowid
 
-                for episodio in temporada.episodios:
+                for temporada in midia.temporadas:
                     self.cursor.execute("""
-                        INSERT INTO Episodio (temporada_id, numero, nome, duracao_minutos)
-                        VALUES (?, ?, ?, ?)
-                    """, (temporada._id, episodio.numero, episodio.nome, episodio.duracao_minutos))
+                        INSERT INTO Temporada (serie_id, numero, nome)
+                        VALUES (?, ?, ?)
+                    """, (midia._id, temporada.numero, temporada.titulo))
+                    temporada._id = self.cursor.lastrowid
+
+                    for episodio in temporada.episodios:
+                        self.cursor.execute("""
+                            INSERT INTO Episodio (temporada_id, numero, nome, duracao_minutos)
+                            VALUES (?, ?, ?, ?)
+                        """, (temporada._id, episodio.numero, episodio.nome, episodio.duracao_minutos))
+                        episodio._id = self.cursor.lastrowid
+
+            self._gravar_elencos([midia])
+            self._atualizar_busca()
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            _descartar_ids([midia])
+            raise
+        self._registrar_escrita()
+        bisect.insort(self._midias, midia, key=_chave_titulo)
+        self._indexar(midia)
+
+    @com_escrita
+    def adicionar_midias_em_lote(self, midias: Iterable[Midia], tamanho_lote: int = 1000,
+                                 commit_a_cada: Optional[int] = None) -> int:
+        """Insere mídias em lote com executemany, numa única transação.
+
+        As mídias são consumidas sob demanda e agrupadas em lotes de
+        `tamanho_lote`. Com `commit_a_cada`, a transação é confirmada a cada
+        tantas mídias; caso contrário, só ao final. Retorna o total inserido.
+        """
 
-        self.conn.commit()
-        self._midias.append(midia)
+        if not self.conn:
+            raise RuntimeError("Conexão com DB indisponível.")
+        if tamanho_lote <= 0:
+            raise ValueError("O tamanho do lote deve ser positivo.")
 
+        if self.conn.in_transaction:
+            self.conn.commit()
+
+        total = 0
+        pendentes: List[Midia] = []
+        lote: List[Midia] = []
+        try:
+            self.cursor.execute("BEGIN IMMEDIATE")
+            for midia in midias:
+                if not isinstance(midia, Midia):
+                    raise TypeError("Apenas objetos Filme ou Serie podem ser inseridos.")
+                lote.append(midia)
+                if len(lote) == tamanho_lote:
+                    self._inserir_lote(lote)
+                    pendentes.extend(lote)
+                    lote = []
+
+                if commit_a_cada and len(pendentes) >= commit_a_cada:
+                    self._atualizar_busca()
+                    self.conn.commit()
+                    total += len(pendentes)
+                    self._registrar_inseridas(pendentes)
+                    pendentes = []
+                    self.cursor.execute("BEGIN IMMEDIATE")
+
+            if lote:
+                self._inserir_lote(lote)
+                pendentes.extend(lote)
+                lote = []
+            self._atualizar_busca()
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            _descartar_ids(pendentes + lote)
+            raise
+
+        total += len(pendentes)
+        self._registrar_inseridas(pendentes)
+        return total
+
+    def _proximo_id(self, tabela: str) -> int:
+
+        row = self.cursor.execute(
+            f"SELECT MAX(COALESCE((SELECT seq FROM sqlite_sequence WHERE name = '{tabela}'), 0), "
+            f"COALESCE((SELECT MAX(id) FROM {tabela}), 0))"
+        ).fetchone()
+        return row[0] + 1
+
+    def _inserir_lote(self, midias: List[Midia]):
+
+        # Dentro da transação de escrita os ids são atribuídos aqui, já que
+        # executemany não devolve o lastrowid de cada linha.
+        proximo_midia = self._proximo_id("Midia")
+        proximo_temporada = self._proximo_id("Temporada")
+        proximo_episodio = self._proximo_id("Episodio")
+
+        linhas_midia = []
+        linhas_temporada = []
+        linhas_episodio = []
+        for midia in midias:
+            midia._id = proximo_midia
+            proximo_midia += 1
+            elenco_db = ",".join(midia.elenco) if midia.elenco else ""
+            duracao = midia.duracao_minutos if midia.tipo == TipoMidia.FILME else 0
+            linhas_midia.append((midia._id, midia.titulo, midia.genero, midia.ano_lancamento, elenco_db, duracao,
+                                 midia.tipo.name, midia.status_visualizacao.name, midia.avaliacao))
+
+            if midia.tipo != TipoMidia.SERIE:
+                continue
+            for temporada in midia.temporadas:
+                temporada._id = proximo_temporada
+                proximo_temporada += 1
+                linhas_temporada.append(
+                    (temporada._id, midia._id, temporada.numero, temporada.titulo))
+                for episodio in temporada.episodios:
+                    episodio._id = proximo_episodio
+                    proximo_episodio += 1
+                    linhas_episodio.append(
+                        (episodio._id, temporada._id, episodio.numero, episodio.nome, episodio.duracao_minutos))
+
+        self.cursor.executemany("""
+            INSERT INTO Midia (id, titulo, genero, ano_lancamento, elenco, duracao_minutos, tipo_midia, status_visualizacao, avaliacao)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, linhas_midia)
+        if linhas_temporada:
+            self.cursor.executemany("""
+                INSERT INTO Temporada (id, serie_id, numero, nome)
+                VALUES (?, ?, ?, ?)
+            """, linhas_temporada)
+        if linhas_episodio:
+            self.cursor.executemany("""
+                INSERT INTO Episodio (id, temporada_id, numero, nome, duracao_minutos)
+                VALUES (?, ?, ?, ?, ?)
+            """, linhas_episodio)
+        self._gravar_elencos(midias)
+
+    def _gravar_elencos(self, midias: List[Midia]):
+
+        nomes = {nome for midia in midias for nome in midia.elenco}
+        if not nomes:
+            return
+
+        self.cursor.executemany(
+            "INSERT OR IGNORE INTO Ator (nome) VALUES (?)", [(nome,) for nome in nomes])
+        ator_ids: Dict[str, int] = {}
+        for bloco in _em_blocos(nomes):
+            marcadores = ",".join("?" * len(bloco))
+            ator_ids.update((nome, ator_id) for ator_id, nome in self.cursor.execute(
+                f"SELECT id, nome FROM Ator WHERE nome IN ({marcadores})", bloco))
+
+        self.cursor.executemany(
+            "INSERT INTO MidiaAtor (midia_id, ator_id, ordem) VALUES (?, ?, ?)",
+            [(midia._id, ator_ids[nome], ordem)
+             for midia in midias for ordem, nome in enumerate(midia.elenco)])
+
+    def _registrar_inseridas(self, midias: List[Midia]):
+
+        if not midias:
+            return
+        self._registrar_escrita()
+        if self._versao_carregada is None:
+            return
+        for midia in midias:
+            self._indexar(midia)
+        if len(midias) == 1:
+            bisect.insort(self._midias, midias[0], key=_chave_titulo)
+        else:
+            self._midias.extend(midias)
+            self._midias.sort(key=_chave_titulo)
+
+    @com_escrita
     def atualizar_midia(self, midia: Midia):
 
         if not self.conn:
@@ -177,16 +809,52 @@ class Catalogo:
             WHERE id = ?
         """, (midia.status_visualizacao.name, midia.avaliacao, midia._id))
         self.conn.commit()
-
+        self._registrar_escrita()
+
+        if midia._id in self._por_id:
+            for status, ids in self._por_status.items():
+                if status == midia.status_visualizacao:
+                    ids.add(midia._id)
+                else:
+                    ids.discard(midia._id)
+            self._descontar_contribuicao(midia._id)
+            self._aplicar_contribuicao(midia)
+
+    @com_leitura
+    def obter_midia_por_id(self, midia_id: int) -> Optional[Midia]:
+        """Mídia pelo id; sem o catálogo carregado em memória, é lida do banco."""
+
+        midia = self._por_id.get(midia_id)
+        if midia is None and self._versao_carregada is None and self.conn:
+            encontradas = self._midias_por_ids([midia_id])
+            midia = encontradas[0] if encontradas else None
+        return midia
+
+    @com_leitura
     def buscar_serie_por_id(self, serie_id: int) -> Optional[Serie]:
 
-        for midia in self._midias:
-            if midia._id == serie_id and midia.tipo == TipoMidia.SERIE:
-                return midia
+        midia = self._por_id.get(serie_id)
+        if midia is not None and midia.tipo == TipoMidia.SERIE:
+            return midia
         return None
 
     def adicionar_episodio_em_temporada(self, serie_id: int, num_temporada: int, episodio: Episodio):
 
+        serie = self.adicionar_episodios(serie_id, num_temporada, [episodio],
+                                         criar_temporada=False)
+        print(
+            f"Episódio {episodio.numero} adicionado à Temporada {num_temporada} de {serie.titulo}.")
+
+    @com_escrita
+    def adicionar_episodios(self, serie_id: int, num_temporada: int, episodios: Iterable[Episodio],
+                            criar_temporada: bool = True) -> Serie:
+        """Adiciona vários episódios a uma temporada numa única transação.
+
+        O lote inteiro é validado antes de qualquer escrita (tipos e números
+        repetidos, no lote ou na temporada). Se a temporada não existir, ela é
+        criada, a menos que criar_temporada seja False. Retorna a série.
+        """
+
         if not self.conn:
             raise RuntimeError("Conexão com DB indisponível.")
 
@@ -194,49 +862,217 @@ class Catalogo:
         if not serie:
             raise ValueError("Série não encontrada no catálogo.")
 
-        temporada_encontrada = next(
+        episodios = list(episodios)
+        temporada = next(
             (t for t in serie.temporadas if t.numero == num_temporada), None)
-        if not temporada_encontrada:
+        if temporada is None and not criar_temporada:
             raise ValueError(
                 f"Temporada {num_temporada} não encontrada na série {serie.titulo}.")
 
-        temporada_encontrada.adicionar_episodio(episodio)
-
+        numeros = set() if temporada is None else {e.numero for e in temporada.episodios}
+        for episodio in episodios:
+            if not isinstance(episodio, Episodio):
+                raise TypeError("O objeto deve ser uma instância de Episodio.")
+            if episodio.numero in numeros:
+                raise ValueError(
+                    f"O episódio número {episodio.numero} já existe na T{num_temporada}.")
+            numeros.add(episodio.numero)
+
+        nova_temporada = None
+        if temporada is None:
+            nova_temporada = Temporada(num_temporada, f"Temporada {num_temporada}")
+
+        if self.conn.in_transaction:
+            self.conn.commit()
+        try:
+            self.cursor.execute("BEGIN IMMEDIATE")
+            if nova_temporada is not None:
+                self.cursor.execute(
+                    "INSERT INTO Temporada (serie_id, numero, nome) VALUES (?, ?, ?)",
+                    (serie._id, nova_temporada.numero, nova_temporada.titulo))
+                nova_temporada._id = self.cursor.lastrowid
+                temporada_id = nova_temporada._id
+            else:
+                temporada_id = temporada._id
+
+            proximo_episodio = self._proximo_id("Episodio")
+            for episodio in episodios:
+                episodio._id = proximo_episodio
+                proximo_episodio += 1
+            self.cursor.executemany("""
+                INSERT INTO Episodio (id, temporada_id, numero, nome, duracao_minutos)
+                VALUES (?, ?, ?, ?, ?)
+            """, [(e._id, temporada_id, e.numero, e.nome, e.duracao_minutos) for e in episodios])
+
+            self._atualizar_busca()
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            for episodio in episodios:
+                episodio._id = None
+            raise
+        self._registrar_escrita()
+
+        if nova_temporada is not None:
+            serie.adicionar_temporada(nova_temporada)
+            temporada = nova_temporada
+        for episodio in episodios:
+            temporada.adicionar_episodio(episodio)
+
+        minutos = sum(e.duracao_minutos for e in episodios)
+        if serie.status_visualizacao == StatusVisualizacao.CONCLUIDO and serie._id in self._contribuicoes:
+            avaliacao, minutos_serie = self._contribuicoes[serie._id]
+            self._contribuicoes[serie._id] = (avaliacao, minutos_serie + minutos)
+            self._minutos_concluidos += minutos
+        return serie
+
+    def _atualizar_busca(self):
+
+        # Recompõe o texto de episódios da busca só para as séries marcadas
+        # pelos triggers (migração 9), uma vez por transação.
         self.cursor.execute("""
-            INSERT INTO Episodio (temporada_id, numero, nome, duracao_minutos)
-            VALUES (?, ?, ?, ?)
-        """, (temporada_encontrada._id, episodio.numero, episodio.nome, episodio.duracao_minutos))
+            UPDATE MidiaBusca SET episodios = COALESCE((
+                SELECT group_concat(e.nome, ' ')
+                FROM Temporada t JOIN Episodio e ON e.temporada_id = t.id
+                WHERE t.serie_id = MidiaBusca.rowid), '')
+            WHERE rowid IN (SELECT midia_id FROM BuscaPendente)
+        """)
+        self.cursor.execute("DELETE FROM BuscaPendente")
 
-        self.conn.commit()
-        self._midias.sort(key=lambda m: m.titulo)
-        print(
-            f"Episódio {episodio.numero} adicionado à Temporada {num_temporada} de {serie.titulo}.")
+    def remover_midia(self, midia_id: int, tipo_midia: Optional[TipoMidia] = None):
+
+        # Temporadas e episódios são removidos em cascata pelo banco; o tipo
+        # é mantido só por compatibilidade.
+        self.remover_midias([midia_id])
+
+    @com_escrita
+    def remover_midias(self, midia_ids: Iterable[int]) -> int:
+        """Remove várias mídias, com suas temporadas e episódios, numa única transação.
 
-    def remover_midia(self, midia_id: int, tipo_midia: TipoMidia):
+        Cada remoção custa O(1) nos índices em memória; a lista ordenada é
+        compactada uma vez, no próximo acesso. Retorna quantas mídias existiam.
+        """
 
         if not self.conn:
             raise RuntimeError("Conexão com DB indisponível.")
 
-        if tipo_midia == TipoMidia.SERIE:
-            temporada_ids = self.cursor.execute(
-                "SELECT id FROM Temporada WHERE serie_id = ?", (midia_id,)
-            ).fetchall()
-            if temporada_ids:
-                for temp_id in [t[0] for t in temporada_ids]:
-                    self.cursor.execute(
-                        "DELETE FROM Episodio WHERE temporada_id = ?", (temp_id,))
+        ids = list(dict.fromkeys(midia_ids))
+        if not ids:
+            return 0
 
-            self.cursor.execute(
-                "DELETE FROM Temporada WHERE serie_id = ?", (midia_id,))
+        if self.conn.in_transaction:
+            self.conn.commit()
+        removidas = 0
+        try:
+            self.cursor.execute("BEGIN IMMEDIATE")
+            for bloco in _em_blocos(ids):
+                marcadores = ",".join("?" * len(bloco))
+                self.cursor.execute(
+                    f"DELETE FROM Midia WHERE id IN ({marcadores})", bloco)
+                removidas += self.cursor.rowcount
+            self._atualizar_busca()
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        self._registrar_escrita()
+
+        for midia_id in ids:
+            self._desindexar(midia_id)
+        return removidas
+
+    def obter_estatisticas_gerais(self, verificar: bool = False, top_n: int = 10) -> Dict[str, Union[int, float, Dict[str, int]]]:
+        """Estatísticas do catálogo.
+
+        Com o catálogo carregado, as partes escalares vêm do agregado mantido
+        em memória (O(1)); sem ele, tudo é calculado no SQL. Com verificar=True,
+        o agregado é comparado a um recálculo completo e divergências geram
+        RuntimeError. top_n define o tamanho das listas top10_filmes/top10_series.
+        """
+
+        # O agregado precisa refletir escritas de outras conexões, como os
+        # rankings, que vêm do banco (custa só um PRAGMA se nada mudou). A
+        # sincronização fica fora da trava de leitura, pois pode gravar.
+        if self._versao_carregada is not None:
+            self.carregar_midias()
+        return self._obter_estatisticas_gerais(verificar, top_n)
+
+    @com_leitura
+    def _obter_estatisticas_gerais(self, verificar: bool, top_n: int) -> Dict[str, Any]:
 
-        self.cursor.execute("DELETE FROM Midia WHERE id = ?", (midia_id,))
-        self.conn.commit()
+        if not self.conn:
+            return self._estatisticas_em_memoria()
+        if self._versao_carregada is None:
+            return calcular_estatisticas(self.conn, self._midias_por_ids, top_n)
+
+        stats = self._estatisticas_agregadas(top_n)
+        if verificar:
+            divergencias = self.verificar_agregado(stats, top_n)
+            if divergencias:
+                raise RuntimeError(
+                    f"Agregado de estatísticas inconsistente: {divergencias}")
+        return stats
 
-        self._midias = [m for m in self._midias if m._id != midia_id]
+    def _estatisticas_agregadas(self, top_n: int = 10) -> Dict[str, Any]:
 
-    def obter_estatisticas_gerais(self) -> Dict[str, Union[int, float, Dict[str, int]]]:
+        total = len(self._por_id)
+        return {
+            'total': total,
+            'filmes': len(self._por_tipo[TipoMidia.FILME]),
+            'series': len(self._por_tipo[TipoMidia.SERIE]),
+            'status': {s.value: len(self._por_status[s]) for s in StatusVisualizacao},
+            'media_avaliacao': round(self._soma_avaliacoes / total, 2) if total else 0.0,
+            'total_avaliacoes': total,
+            'total_horas_assistidas': round(self._minutos_concluidos / 60, 1),
+            'top10_filmes': self.obter_ranking(top_n, TipoMidia.FILME),
+            'top10_series': self.obter_ranking(top_n, TipoMidia.SERIE),
+            'generos': {
+                genero: {'filmes': len(por_tipo[TipoMidia.FILME]),
+                         'series': len(por_tipo[TipoMidia.SERIE])}
+                for genero, por_tipo in self._por_genero.items()
+            }
+        }
 
-        total = len(self._midias)
+    @com_leitura
+    def verificar_agregado(self, stats: Optional[Dict[str, Any]] = None,
+                           top_n: int = 10) -> Dict[str, Tuple[Any, Any]]:
+        """Compara o agregado com um recálculo completo; retorna {campo: (agregado, recalculado)}.
+
+        top_n deve ser o mesmo usado para montar stats: os rankings recalculados
+        têm esse tamanho, então um título que falte no agregado aparece como
+        divergência em vez de ser cortado junto com a lista.
+        """
+
+        if stats is None:
+            stats = self._estatisticas_agregadas(top_n)
+        esperado = self._estatisticas_em_memoria(top_n, top_n)
+
+        divergencias: Dict[str, Tuple[Any, Any]] = {}
+        for chave, valor in esperado.items():
+            atual = stats[chave]
+            if chave.startswith('top10'):
+                atual = [m._id for m in atual]
+                valor = [m._id for m in valor]
+            elif chave == 'media_avaliacao':
+                # Somas de float feitas em ordens diferentes.
+                if abs(atual - valor) <= 0.01:
+                    continue
+            if atual != valor:
+                divergencias[chave] = (atual, valor)
+        return divergencias
+
+    @com_leitura
+    def _midias_por_ids(self, midia_ids: List[int]) -> List[Midia]:
+
+        faltantes = [i for i in midia_ids if i not in self._por_id]
+        carregadas = {m._id: m for m in self._carregar_grafo(faltantes)} if faltantes else {}
+        return [self._por_id.get(i) or carregadas[i] for i in midia_ids if i in self._por_id or i in carregadas]
+
+    def _estatisticas_em_memoria(self, top_filmes: int = 10, top_series: int = 10) -> Dict[str, Union[int, float, Dict[str, int]]]:
+        """Recálculo completo sobre a lista em memória, sem usar índices nem o agregado."""
+
+        midias = self.midias
+        total = len(midias)
 
         stats: Dict[str, Any] = {
             'total': total,
@@ -253,7 +1089,7 @@ class Catalogo:
 
         avaliacoes = []
         total_minutos_assistidos = 0
-        for midia in self._midias:
+        for midia in midias:
             if midia.tipo == TipoMidia.FILME:
                 stats['filmes'] += 1
             elif midia.tipo == TipoMidia.SERIE:
@@ -287,18 +1123,161 @@ class Catalogo:
         stats['total_horas_assistidas'] = round(
             total_minutos_assistidos / 60, 1)
 
-        filmes_avaliados = [m for m in self._midias if m.tipo ==
+        filmes_avaliados = [m for m in midias if m.tipo ==
                             TipoMidia.FILME and m.avaliacao > 0]
-        series_avaliadas = [m for m in self._midias if m.tipo ==
+        series_avaliadas = [m for m in midias if m.tipo ==
                             TipoMidia.SERIE and m.avaliacao > 0]
 
+        def chave_ranking(m): return (-m.avaliacao, m.titulo, m._id)
         stats['top10_filmes'] = sorted(
-            filmes_avaliados, key=lambda m: m.avaliacao, reverse=True)[:10]
+            filmes_avaliados, key=chave_ranking)[:top_filmes]
         stats['top10_series'] = sorted(
-            series_avaliadas, key=lambda m: m.avaliacao, reverse=True)[:10]
+            series_avaliadas, key=chave_ranking)[:top_series]
 
         return stats
 
+    def obter_ranking(self, n: int = 10, tipo: Optional[TipoMidia] = None,
+                      genero: Optional[str] = None, decada: Optional[int] = None) -> List[Midia]:
+
+        if not self.conn:
+            raise RuntimeError("Conexão com DB indisponível.")
+        return self._midias_por_ids(ids_ranking(self.conn, n, tipo, genero, decada))
+
+    def obter_rankings_por_genero(self, n: int = 10, tipo: Optional[TipoMidia] = None) -> Dict[str, List[Midia]]:
+
+        if not self.conn:
+            raise RuntimeError("Conexão com DB indisponível.")
+        return {genero: self.obter_ranking(n, tipo, genero=genero)
+                for genero in generos_avaliados(self.conn, tipo)}
+
+    def obter_rankings_por_decada(self, n: int = 10, tipo: Optional[TipoMidia] = None) -> Dict[int, List[Midia]]:
+
+        if not self.conn:
+            raise RuntimeError("Conexão com DB indisponível.")
+        return {decada: self.obter_ranking(n, tipo, decada=decada)
+                for decada in decadas_avaliadas(self.conn, tipo)}
+
+    def pagina_midias(self, tamanho: int = 20, apos: Optional[Chave] = None,
+                      antes: Optional[Chave] = None, tipo: Optional[TipoMidia] = None,
+                      status: Optional[StatusVisualizacao] = None,
+                      genero: Optional[str] = None) -> Pagina:
+        """Uma página da listagem por título, lida direto do banco.
+
+        A navegação usa as chaves da própria página (Pagina.ultima como
+        `apos`, Pagina.primeira como `antes`). Só as mídias da página são
+        hidratadas quando o catálogo não está carregado em memória.
+        """
+
+        if not self.conn:
+            raise RuntimeError("Conexão com DB indisponível.")
+        if tamanho <= 0:
+            raise ValueError("O tamanho da página deve ser positivo.")
+
+        # Com o catálogo em memória, os objetos usados precisam refletir
+        # escritas de outras conexões (custa só um PRAGMA se nada mudou).
+        if self._versao_carregada is not None:
+            self.carregar_midias()
+
+        ids, tem_anterior, tem_proxima = ids_pagina(
+            self.conn, tamanho, apos, antes, tipo, status, genero)
+        return Pagina(self._midias_por_ids(ids), tem_anterior, tem_proxima)
+
+    def buscar(self, texto: str, limite: int = 50) -> List[Midia]:
+        """Busca textual em título, gênero, elenco e nomes de episódios.
+
+        Cada termo casa por prefixo, sem diferenciar acentos nem maiúsculas;
+        termos de um só caractere são ignorados. Os resultados vêm em grupos,
+        cada um consultado só quando os anteriores não chegam a `limite`:
+        casamentos no título, nas colunas de texto (título, elenco e
+        episódios), só no gênero e, por fim, combinando colunas. Dentro de
+        cada grupo, a ordem é a relevância (bm25, com peso maior para o título).
+        """
+
+        if not self.conn:
+            raise RuntimeError("Conexão com DB indisponível.")
+
+        consulta = _consulta_fts(texto)
+        if not consulta:
+            return []
+
+        # Episódios gravados por outras conexões podem ter deixado séries
+        # pendentes de reindexação.
+        if self.conn.execute("SELECT 1 FROM BuscaPendente LIMIT 1").fetchone():
+            self._reindexar_busca_pendente()
+
+        # Cada grupo pontua todas as mídias que casam com ele (cortar antes do
+        # ORDER BY escolheria os candidatos pela ordem do rowid), então os
+        # grupos vão do menor ao maior conjunto típico: uma palavra de gênero
+        # casa com 20-30% do catálogo e não deve ser pontuada quando o título
+        # já basta. O gênero tem poucos valores fixos, e as mídias que casam
+        # só por ele empatam no bm25; esse grupo sai na ordem do id, sem
+        # pontuar, que é o desempate que o bm25 daria.
+        grupos = (
+            (f"{{titulo}} : ({consulta})", True),
+            (f"{{titulo elenco episodios}} : ({consulta})", True),
+            (f"{{genero}} : ({consulta})", False),
+            (consulta, True),
+        )
+        ids: List[int] = []
+        encontrados: Set[int] = set()
+        for consulta_grupo, pontuar in grupos:
+            # Basta pedir `limite` linhas: no máximo len(ids) já foram vistas.
+            for midia_id in self._ids_busca(consulta_grupo, limite, pontuar):
+                if midia_id not in encontrados and len(ids) < limite:
+                    ids.append(midia_id)
+                    encontrados.add(midia_id)
+            if len(ids) == limite:
+                break
+        return self._midias_por_ids(ids)
+
+    def _ids_busca(self, consulta: str, limite: int, pontuar: bool) -> List[int]:
+
+        ordem = "bm25(MidiaBusca, 10.0, 2.0, 4.0, 1.0), rowid" if pontuar else "rowid"
+        return [row[0] for row in self.conn.execute(f"""
+            SELECT rowid
+            FROM MidiaBusca
+            WHERE MidiaBusca MATCH ?
+            ORDER BY {ordem}
+            LIMIT ?
+        """, (consulta, limite))]
+
+    @com_escrita
+    def _reindexar_busca_pendente(self):
+
+        if self.conn.in_transaction:
+            self.conn.commit()
+        self._atualizar_busca()
+        self.conn.commit()
+
+    def midias_por_ator(self, nome: str) -> List[Midia]:
+        """Mídias do elenco de um ator (nome exato, sem diferenciar maiúsculas)."""
+
+        if not self.conn:
+            raise RuntimeError("Conexão com DB indisponível.")
+
+        ids = [row[0] for row in self.conn.execute("""
+            SELECT DISTINCT ma.midia_id
+            FROM Ator a JOIN MidiaAtor ma ON ma.ator_id = a.id
+            WHERE a.nome = ? COLLATE NOCASE
+        """, (nome.strip(),))]
+        return sorted(self._midias_por_ids(ids), key=_chave_titulo)
+
+    @com_leitura
     def obter_midias_por_status(self, status: StatusVisualizacao) -> List[Midia]:
 
-        return [midia for midia in self._midias if midia.status_visualizacao == status]
+        return self._ordenar_por_titulo(self._por_status[status])
+
+    @com_leitura
+    def obter_midias_por_tipo(self, tipo: TipoMidia) -> List[Midia]:
+
+        return self._ordenar_por_titulo(self._por_tipo[tipo])
+
+    @com_leitura
+    def obter_midias_por_genero(self, genero: str, tipo: Optional[TipoMidia] = None) -> List[Midia]:
+
+        por_tipo = self._por_genero.get(genero)
+        if por_tipo is None:
+            return []
+        if tipo is not None:
+            return self._ordenar_por_titulo(por_tipo[tipo])
+        return self._ordenar_por_titulo(por_tipo[TipoMidia.FILME] | por_tipo[TipoMidia.SERIE])
@@ -0,0 +1,235 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from catalogo import Catalogo
+from conexao import PerfilConexao
+from midia import Episodio, Midia, StatusVisualizacao, TipoMidia
+from midia_concreta import Serie
+from paginacao import Chave, Pagina
+
+
+def _chamar(catalogo: Catalogo, nome: str, args: tuple, kwargs: dict) -> Any:
+
+    # Roda no executor; propriedades (midias, versao_dados) também são lidas aqui.
+    valor = getattr(catalogo, nome)
+    return valor(*args, **kwargs) if callable(valor) else valor
+
+
+class _LeituraCompartilhada:
+    """Uma leitura em andamento no executor e quantas chamadas a aguardam."""
+
+    __slots__ = ("futuro", "esperando")
+
+    def __init__(self, futuro: asyncio.Future):
+        self.futuro = futuro
+        self.esperando = 0
+
+
+class AsyncCatalogo:
+    """Fachada asyncio sobre o Catalogo, para uso dentro de um event loop.
+
+    Todo acesso ao banco roda num executor próprio, nunca no loop. Com
+    concorrente=True (padrão), o Catalogo é o thread-safe e o executor tem
+    max_threads threads; senão, uma única thread, dona da conexão.
+
+    Leituras iguais (mesmo método e argumentos) feitas enquanto uma delas
+    ainda está em andamento são agrupadas numa só execução, e todas recebem
+    o mesmo objeto de resultado, que deve ser tratado como somente leitura.
+    Uma leitura pedida depois de uma escrita nunca é agrupada com uma
+    anterior a ela.
+
+    Cancelamento: uma operação cancelada antes de começar no executor não é
+    executada. Depois de começar, ela vai até o fim (uma transação não é
+    interrompida no meio) e só o resultado é descartado; uma leitura
+    agrupada só é cancelada quando todas as chamadas que a aguardam desistem.
+
+    As séries retornadas carregam as temporadas no primeiro acesso, que lê o
+    banco na thread que acessa; chame pre_carregar_temporadas antes de
+    percorrer as árvores no loop.
+
+    Uso:
+        async with AsyncCatalogo(Path("dados.db")) as catalogo:
+            stats = await catalogo.obter_estatisticas_gerais()
+    """
+
+    def __init__(self, db_path: Path = Path("dados.db"), carregar: bool = True,
+                 perfil: Union[str, PerfilConexao, None] = None, concorrente: bool = True,
+                 max_threads: int = 4):
+
+        if max_threads < 1:
+            raise ValueError("max_threads deve ser positivo.")
+        self._parametros = dict(db_path=db_path, carregar=carregar, perfil=perfil,
+                                concorrente=concorrente)
+        self._executor = ThreadPoolExecutor(max_workers=max_threads if concorrente else 1,
+                                            thread_name_prefix="catalogo")
+        self.catalogo: Optional[Catalogo] = None
+        self._em_andamento: Dict[tuple, _LeituraCompartilhada] = {}
+        # Incrementada a cada escrita: faz parte da chave das leituras agrupadas.
+        self._geracao = 0
+
+    async def abrir(self) -> "AsyncCatalogo":
+
+        # O Catalogo é criado no executor: a conexão (e as migrações) ficam
+        # fora do loop e, sem o modo concorrente, na thread que a usará.
+        if self.catalogo is None:
+            self.catalogo = await self._executar(functools.partial(Catalogo, **self._parametros))
+        return self
+
+    async def fechar(self):
+
+        if self.catalogo is not None:
+            await self._executar(self.catalogo.fechar_conexao)
+            self.catalogo = None
+        self._executor.shutdown(wait=False)
+
+    async def __aenter__(self) -> "AsyncCatalogo":
+        return await self.abrir()
+
+    async def __aexit__(self, *excecao):
+        await self.fechar()
+
+    async def _executar(self, funcao: Callable[[], Any]) -> Any:
+
+        # Cancelar o futuro do asyncio cancela a tarefa no executor se ela
+        # ainda não tiver começado.
+        return await asyncio.get_running_loop().run_in_executor(self._executor, funcao)
+
+    def _chamada(self, nome: str, args: tuple, kwargs: dict) -> Callable[[], Any]:
+
+        if self.catalogo is None:
+            raise RuntimeError("AsyncCatalogo não foi aberto (use abrir() ou async with).")
+        return functools.partial(_chamar, self.catalogo, nome, args, kwargs)
+
+    async def _ler(self, nome: str, *args, **kwargs) -> Any:
+
+        chamada = self._chamada(nome, args, kwargs)
+        chave = (self._geracao, nome, args, tuple(sorted(kwargs.items())))
+        try:
+            hash(chave)
+        except TypeError:
+            return await self._executar(chamada)
+
+        leitura = self._em_andamento.get(chave)
+        if leitura is None:
+            futuro = asyncio.get_running_loop().run_in_executor(self._executor, chamada)
+            leitura = self._em_andamento[chave] = _LeituraCompartilhada(futuro)
+            futuro.add_done_callback(functools.partial(self._leitura_concluida, chave))
+
+        leitura.esperando += 1
+        try:
+            # shield: cancelar uma das chamadas não cancela a leitura das outras.
+            return await asyncio.shield(leitura.futuro)
+        except asyncio.CancelledError:
+            if leitura.esperando == 1:
+                leitura.futuro.cancel()
+            raise
+        finally:
+            leitura.esperando -= 1
+
+    def _leitura_concluida(self, chave: tuple, futuro: asyncio.Future):
+
+        leitura = self._em_andamento.get(chave)
+        if leitura is not None and leitura.futuro is futuro:
+            del self._em_andamento[chave]
+        # Marca a exceção como recuperada quando ninguém mais a aguarda.
+        if not futuro.cancelled():
+            futuro.exception()
+
+    async def _escrever(self, nome: str, *args, **kwargs) -> Any:
+
+        chamada = self._chamada(nome, args, kwargs)
+        self._geracao += 1
+        return await self._executar(chamada)
+
+    # Leituras
+
+    async def versao_dados(self) -> Tuple[int, int]:
+        return await self._ler("versao_dados")
+
+    async def carregar_midias(self, forcar: bool = False, prefetch: bool = False):
+        # Idempotente: chamadas simultâneas recarregam uma vez só.
+        return await self._ler("carregar_midias", forcar, prefetch)
+
+    async def pre_carregar_temporadas(self, midias: Optional[Iterable[Midia]] = None):
+        # Séries carregadas no executor não leem o banco a partir do loop.
+        return await self._executar(self._chamada("pre_carregar_temporadas", (midias,), {}))
+
+    async def listar_midias(self) -> List[Midia]:
+        return await self._ler("midias")
+
+    async def obter_midia_por_id(self, midia_id: int) -> Optional[Midia]:
+        return await self._ler("obter_midia_por_id", midia_id)
+
+    async def buscar_serie_por_id(self, serie_id: int) -> Optional[Serie]:
+        return await self._ler("buscar_serie_por_id", serie_id)
+
+    async def obter_estatisticas_gerais(self, verificar: bool = False,
+                                        top_n: int = 10) -> Dict[str, Any]:
+        return await self._ler("obter_estatisticas_gerais", verificar, top_n)
+
+    async def obter_ranking(self, n: int = 10, tipo: Optional[TipoMidia] = None,
+                            genero: Optional[str] = None,
+                            decada: Optional[int] = None) -> List[Midia]:
+        return await self._ler("obter_ranking", n, tipo, genero, decada)
+
+    async def obter_rankings_por_genero(self, n: int = 10,
+                                        tipo: Optional[TipoMidia] = None) -> Dict[str, List[Midia]]:
+        return await self._ler("obter_rankings_por_genero", n, tipo)
+
+    async def obter_rankings_por_decada(self, n: int = 10,
+                                        tipo: Optional[TipoMidia] = None) -> Dict[int, List[Midia]]:
+        return await self._ler("obter_rankings_por_decada", n, tipo)
+
+    async def pagina_midias(self, tamanho: int = 20, apos: Optional[Chave] = None,
+                            antes: Optional[Chave] = None, tipo: Optional[TipoMidia] = None,
+                            status: Optional[StatusVisualizacao] = None,
+                            genero: Optional[str] = None) -> Pagina:
+        return await self._ler("pagina_midias", tamanho, apos, antes, tipo, status, genero)
+
+    async def buscar(self, texto: str, limite: int = 50) -> List[Midia]:
+        return await self._ler("buscar", texto, limite)
+
+    async def midias_por_ator(self, nome: str) -> List[Midia]:
+        return await self._ler("midias_por_ator", nome)
+
+    async def obter_midias_por_status(self, status: StatusVisualizacao) -> List[Midia]:
+        return await self._ler("obter_midias_por_status", status)
+
+    async def obter_midias_por_tipo(self, tipo: TipoMidia) -> List[Midia]:
+        return await self._ler("obter_midias_por_tipo", tipo)
+
+    async def obter_midias_por_genero(self, genero: str,
+                                      tipo: Optional[TipoMidia] = None) -> List[Midia]:
+        return await self._ler("obter_midias_por_genero", genero, tipo)
+
+    # Escritas
+
+    async def adicionar_midia(self, midia: Midia):
+        return await self._escrever("adicionar_midia", midia)
+
+    async def adicionar_midias_em_lote(self, midias: Iterable[Midia], tamanho_lote: int = 1000,
+                                       commit_a_cada: Optional[int] = None) -> int:
+        return await self._escrever("adicionar_midias_em_lote", midias, tamanho_lote, commit_a_cada)
+
+    async def atualizar_midia(self, midia: Midia):
+        return await self._escrever("atualizar_midia", midia)
+
+    async def adicionar_episodio_em_temporada(self, serie_id: int, num_temporada: int,
+                                              episodio: Episodio):
+        return await self._escrever("adicionar_episodio_em_temporada",
+                                    serie_id, num_temporada, episodio)
+
+    async def adicionar_episodios(self, serie_id: int, num_temporada: int,
+                                  episodios: Iterable[Episodio],
+                                  criar_temporada: bool = True) -> Serie:
+        return await self._escrever("adicionar_episodios", serie_id, num_temporada,
+                                    list(episodios), criar_temporada)
+
+    async def remover_midia(self, midia_id: int, tipo_midia: Optional[TipoMidia] = None):
+        return await self._escrever("remover_midia", midia_id, tipo_midia)
+
+    async def remover_midias(self, midia_ids: Iterable[int]) -> int:
+        return await self._escrever("remover_midias", list(midia_ids))
@@ -0,0 +1,105 @@
+import functools
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Callable, ContextManager, Iterator, Optional
+
+
+class TravaLeituraEscrita:
+    """Trava de leitores e escritor: várias leituras simultâneas ou uma escrita.
+
+    Escritores esperando têm preferência sobre novos leitores, para não ficarem
+    sem vez em cargas de leitura intensas. A mesma thread pode reentrar na
+    leitura e na escrita, e ler enquanto escreve; passar de leitura para
+    escrita não é permitido, pois duas threads fazendo isso travariam.
+    """
+
+    def __init__(self):
+        self._condicao = threading.Condition(threading.Lock())
+        self._leitores = 0
+        self._escritor: Optional[int] = None
+        self._escritores_esperando = 0
+        self._local = threading.local()
+
+    def escrevendo(self) -> bool:
+        """Indica se a thread atual detém a escrita."""
+        return self._escritor == threading.get_ident()
+
+    def lendo(self) -> bool:
+        """Indica se a thread atual detém a leitura (ou a escrita, que a inclui)."""
+        return self.escrevendo() or getattr(self._local, "leituras", 0) > 0
+
+    @contextmanager
+    def leitura(self) -> Iterator[None]:
+
+        if self.escrevendo():
+            yield
+            return
+
+        profundidade = getattr(self._local, "leituras", 0)
+        if profundidade == 0:
+            with self._condicao:
+                while self._escritor is not None or self._escritores_esperando:
+                    self._condicao.wait()
+                self._leitores += 1
+        self._local.leituras = profundidade + 1
+        try:
+            yield
+        finally:
+            self._local.leituras = profundidade
+            if profundidade == 0:
+                with self._condicao:
+                    self._leitores -= 1
+                    if self._leitores == 0:
+                        self._condicao.notify_all()
+
+    @contextmanager
+    def escrita(self) -> Iterator[None]:
+
+        if self.escrevendo():
+            yield
+            return
+        if getattr(self._local, "leituras", 0):
+            raise RuntimeError("Não é possível obter a escrita durante uma leitura.")
+
+        with self._condicao:
+            self._escritores_esperando += 1
+            try:
+                while self._escritor is not None or self._leitores:
+                    self._condicao.wait()
+            finally:
+                self._escritores_esperando -= 1
+            self._escritor = threading.get_ident()
+        try:
+            yield
+        finally:
+            with self._condicao:
+                self._escritor = None
+                self._condicao.notify_all()
+
+
+def _trava_de(objeto, modo: str) -> ContextManager:
+
+    trava: Optional[TravaLeituraEscrita] = getattr(objeto, "_trava", None)
+    if trava is None:
+        return nullcontext()
+    return trava.leitura() if modo == "leitura" else trava.escrita()
+
+
+def com_leitura(metodo: Callable) -> Callable:
+    """Executa o método sob a leitura da trava do objeto (se houver uma)."""
+
+    @functools.wraps(metodo)
+    def envoltorio(self, *args, **kwargs):
+        with _trava_de(self, "leitura"):
+            return metodo(self, *args, **kwargs)
+    return envoltorio
+
+
+def com_escrita(metodo: Callable) -> Callable:
+    """Executa o método sob a escrita da trava do objeto (se houver uma)."""
+
+    @functools.wraps(metodo)
+    def envoltorio(self, *args, **kwargs):
+        with _trava_de(self, "escrita"):
+            return metodo(self, *args, **kwargs)
+    return envoltorio
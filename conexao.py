@@ -0,0 +1,103 @@
+import sqlite3
+from typing import Dict, Optional, Union
+
+
+MODOS_JOURNAL = ("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF")
+NIVEIS_SYNCHRONOUS = ("OFF", "NORMAL", "FULL", "EXTRA")
+MODOS_TEMP_STORE = ("DEFAULT", "FILE", "MEMORY")
+
+
+class PerfilConexao:
+    """Ajustes de desempenho aplicados por PRAGMA a cada conexão do Catalogo.
+
+    Atributos None mantêm o padrão do SQLite. cache_size segue a convenção do
+    PRAGMA (negativo = KiB, positivo = páginas); mmap_size é em bytes e
+    busy_timeout em milissegundos.
+    """
+
+    def __init__(self, journal_mode: Optional[str] = None, synchronous: Optional[str] = None,
+                 cache_size: Optional[int] = None, mmap_size: Optional[int] = None,
+                 temp_store: Optional[str] = None, busy_timeout: Optional[int] = None):
+
+        self.journal_mode = _validar(journal_mode, MODOS_JOURNAL, "journal_mode")
+        self.synchronous = _validar(synchronous, NIVEIS_SYNCHRONOUS, "synchronous")
+        self.temp_store = _validar(temp_store, MODOS_TEMP_STORE, "temp_store")
+        if mmap_size is not None and mmap_size < 0:
+            raise ValueError("mmap_size não pode ser negativo.")
+        if busy_timeout is not None and busy_timeout < 0:
+            raise ValueError("busy_timeout não pode ser negativo.")
+        self.cache_size = cache_size
+        self.mmap_size = mmap_size
+        self.busy_timeout = busy_timeout
+
+    def aplicar(self, conn: sqlite3.Connection):
+
+        # busy_timeout vem primeiro: trocar o journal para WAL pode esperar
+        # por outra conexão.
+        if self.busy_timeout is not None:
+            conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout)}")
+        if self.journal_mode is not None:
+            modo = conn.execute(f"PRAGMA journal_mode = {self.journal_mode}").fetchone()[0]
+            if modo.upper() != self.journal_mode and _em_arquivo(conn):
+                raise RuntimeError(
+                    f"Não foi possível ativar o journal_mode {self.journal_mode} (ficou {modo}).")
+        if self.synchronous is not None:
+            conn.execute(f"PRAGMA synchronous = {self.synchronous}")
+        if self.cache_size is not None:
+            conn.execute(f"PRAGMA cache_size = {int(self.cache_size)}")
+        if self.mmap_size is not None:
+            conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        if self.temp_store is not None:
+            conn.execute(f"PRAGMA temp_store = {self.temp_store}")
+
+    def __repr__(self) -> str:
+
+        ajustes = ", ".join(f"{nome}={valor!r}" for nome, valor in vars(self).items()
+                            if valor is not None)
+        return f"PerfilConexao({ajustes})"
+
+
+def _em_arquivo(conn: sqlite3.Connection) -> bool:
+
+    # Bancos em memória só aceitam os journals MEMORY e OFF.
+    return bool(conn.execute("PRAGMA database_list").fetchone()[2])
+
+
+def _validar(valor: Optional[str], permitidos: tuple, nome: str) -> Optional[str]:
+
+    if valor is None:
+        return None
+    valor = valor.upper()
+    if valor not in permitidos:
+        raise ValueError(f"Valor inválido para {nome}: {valor!r}.")
+    return valor
+
+
+PERFIS: Dict[str, PerfilConexao] = {
+    # Padrões do SQLite: journal de rollback e fsync completo a cada commit.
+    "padrao": PerfilConexao(),
+    # WAL com synchronous=NORMAL: o commit só grava no WAL, sem fsync; o fsync
+    # acontece nos checkpoints. Uma queda de energia pode perder as últimas
+    # transações, mas nunca corrompe o banco.
+    "producao": PerfilConexao(
+        journal_mode="WAL",
+        synchronous="NORMAL",
+        cache_size=-64 * 1024,          # 64 MiB
+        mmap_size=256 * 1024 * 1024,    # 256 MiB
+        temp_store="MEMORY",
+        busy_timeout=5000,
+    ),
+}
+
+
+def obter_perfil(perfil: Union[str, PerfilConexao, None]) -> PerfilConexao:
+
+    if perfil is None:
+        return PERFIS["padrao"]
+    if isinstance(perfil, PerfilConexao):
+        return perfil
+    try:
+        return PERFIS[perfil]
+    except KeyError:
+        raise ValueError(
+            f"Perfil de conexão desconhecido: {perfil!r} (use um de {', '.join(PERFIS)}).") from None
@@ -0,0 +1,76 @@
+import sqlite3
+from typing import Any, Callable, Dict, List
+
+from midia import Midia, StatusVisualizacao, TipoMidia
+from ranking import ids_ranking
+
+
+# Avaliação como ela fica após a validação de Midia.avaliacao: limitada a
+# 0.0-10.0 e zerada para mídias que não estão concluídas.
+AVALIACAO_EFETIVA = """
+    CASE WHEN status_visualizacao = 'CONCLUIDO'
+         THEN MAX(0.0, MIN(avaliacao, 10.0))
+         ELSE 0.0 END
+"""
+
+
+def calcular_estatisticas(conn: sqlite3.Connection,
+                          carregar_midias: Callable[[List[int]], List[Midia]],
+                          top_n: int = 10) -> Dict[str, Any]:
+    """Calcula o dicionário de Catalogo.obter_estatisticas_gerais direto no SQL.
+
+    Contagens, médias e somas de duração são agregadas pelo banco, sem criar
+    objetos; apenas as mídias dos rankings são hidratadas, via carregar_midias.
+    """
+
+    stats: Dict[str, Any] = {
+        'total': 0,
+        'filmes': 0,
+        'series': 0,
+        'status': {s.value: 0 for s in StatusVisualizacao},
+        'media_avaliacao': 0.0,
+        'total_avaliacoes': 0,
+        'total_horas_assistidas': 0.0,
+        'top10_filmes': [],
+        'top10_series': [],
+        'generos': {}
+    }
+
+    # Uma única varredura do índice idx_midia_estatisticas cobre contagens,
+    # avaliações e minutos assistidos; para séries, duracao_minutos já é o
+    # total dos episódios (migração 8), sem consultar Episodio.
+    soma_avaliacoes = 0.0
+    minutos_concluidos = 0
+    for genero, tipo_nome, status_nome, quantidade, avaliadas, soma, minutos in conn.execute(f"""
+        SELECT genero, tipo_midia, status_visualizacao, COUNT(*), COUNT(avaliacao),
+               TOTAL({AVALIACAO_EFETIVA}), TOTAL(duracao_minutos)
+        FROM Midia
+        GROUP BY genero, tipo_midia, status_visualizacao
+    """):
+        stats['total'] += quantidade
+        chave_tipo = 'filmes' if tipo_nome == TipoMidia.FILME.name else 'series'
+        stats[chave_tipo] += quantidade
+        stats['status'][StatusVisualizacao[status_nome].value] += quantidade
+        stats['total_avaliacoes'] += avaliadas
+        soma_avaliacoes += soma
+        if status_nome == StatusVisualizacao.CONCLUIDO.name:
+            minutos_concluidos += int(minutos)
+
+        # Contagem por gênero
+        if genero not in stats['generos']:
+            stats['generos'][genero] = {'filmes': 0, 'series': 0}
+        stats['generos'][genero][chave_tipo] += quantidade
+
+    if stats['total_avaliacoes']:
+        stats['media_avaliacao'] = round(
+            soma_avaliacoes / stats['total_avaliacoes'], 2)
+
+    stats['total_horas_assistidas'] = round(minutos_concluidos / 60, 1)
+
+    stats['top10_filmes'] = carregar_midias(
+        ids_ranking(conn, top_n, TipoMidia.FILME))
+    stats['top10_series'] = carregar_midias(
+        ids_ranking(conn, top_n, TipoMidia.SERIE))
+
+    return stats
+
@@ -0,0 +1,125 @@
+"""Exportação em streaming do catálogo para JSON-lines ou CSV.
+
+As mídias são lidas uma a uma por Catalogo.iterar_midias e convertidas com
+to_dict, então a exportação usa memória constante, sem montar a lista do
+catálogo. Os arquivos gerados seguem o formato aceito por importador.py;
+no CSV, o elenco vai como uma lista JSON.
+
+Uso: python exportador.py saida.jsonl [--db dados.db] [--formato csv|jsonl]
+     [--perfil padrao|producao]
+     (use "-" como saída para escrever na saída padrão)
+"""
+import argparse
+import csv
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+
+from catalogo import Catalogo
+from conexao import PERFIS
+from midia import TipoMidia
+
+
+COLUNAS_CSV = [
+    "id", "tipo", "titulo", "genero", "ano_lancamento", "elenco", "duracao_minutos",
+    "status_visualizacao", "avaliacao", "temporada_numero", "temporada_titulo",
+    "episodio_numero", "episodio_nome", "episodio_duracao",
+]
+
+
+def iterar_registros(catalogo: Catalogo) -> Iterator[Dict[str, Any]]:
+
+    for midia in catalogo.iterar_midias():
+        yield midia.to_dict()
+
+
+def exportar_jsonl(catalogo: Catalogo, saida: TextIO) -> int:
+
+    total = 0
+    for registro in iterar_registros(catalogo):
+        saida.write(json.dumps(registro, ensure_ascii=False))
+        saida.write("\n")
+        total += 1
+    return total
+
+
+def _linhas_csv(registro: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+
+    base = {
+        "id": registro["id"],
+        "tipo": registro["tipo"],
+        "titulo": registro["titulo"],
+        "genero": registro["genero"],
+        "ano_lancamento": registro["ano_lancamento"],
+        # Lista JSON: nomes com vírgula ("X, Jr.") sobrevivem à volta.
+        "elenco": json.dumps(registro["elenco"], ensure_ascii=False),
+        "duracao_minutos": registro.get("duracao_minutos", ""),
+        "status_visualizacao": registro["status_visualizacao"],
+        "avaliacao": registro["avaliacao"],
+    }
+
+    if registro["tipo"] != TipoMidia.SERIE.name or not registro["temporadas"]:
+        yield base
+        return
+
+    # Séries viram uma linha por episódio (ou por temporada vazia).
+    for temporada in registro["temporadas"]:
+        linha_temporada = dict(base, temporada_numero=temporada["numero"],
+                               temporada_titulo=temporada["titulo"])
+        if not temporada["episodios"]:
+            yield linha_temporada
+        for episodio in temporada["episodios"]:
+            yield dict(linha_temporada, episodio_numero=episodio["numero"],
+                       episodio_nome=episodio["nome"],
+                       episodio_duracao=episodio["duracao_minutos"])
+
+
+def exportar_csv(catalogo: Catalogo, saida: TextIO) -> int:
+
+    escritor = csv.DictWriter(saida, fieldnames=COLUNAS_CSV)
+    escritor.writeheader()
+    total = 0
+    for registro in iterar_registros(catalogo):
+        escritor.writerows(_linhas_csv(registro))
+        total += 1
+    return total
+
+
+def exportar(catalogo: Catalogo, saida: TextIO, formato: str = "jsonl") -> int:
+
+    if formato == "jsonl":
+        return exportar_jsonl(catalogo, saida)
+    if formato == "csv":
+        return exportar_csv(catalogo, saida)
+    raise ValueError(f"Formato de exportação não suportado: {formato!r}.")
+
+
+def main(argv: Optional[List[str]] = None):
+
+    parser = argparse.ArgumentParser(
+        description="Exporta o catálogo para um arquivo JSON-lines ou CSV.")
+    parser.add_argument("saida")
+    parser.add_argument("--db", type=Path, default=Path("dados.db"))
+    parser.add_argument("--perfil", choices=sorted(PERFIS), default="producao")
+    parser.add_argument("--formato", choices=["csv", "jsonl"])
+    args = parser.parse_args(argv)
+
+    formato = args.formato or (
+        "csv" if args.saida.lower().endswith(".csv") else "jsonl")
+
+    catalogo = Catalogo(db_path=args.db, carregar=False, perfil=args.perfil)
+    try:
+        if args.saida == "-":
+            total = exportar(catalogo, sys.stdout, formato)
+        else:
+            with open(args.saida, "w", encoding="utf-8", newline="") as saida:
+                total = exportar(catalogo, saida, formato)
+    finally:
+        catalogo.fechar_conexao()
+    print(f"{total} mídias exportadas.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,281 @@
+"""Importação em streaming de catálogos a partir de arquivos CSV ou JSON-lines.
+
+O pipeline é uma cadeia de geradores (leitura -> validação -> inserção em lote),
+então a memória usada pela importação não depende do tamanho do arquivo.
+
+Formato JSONL: um objeto por linha, com as chaves tipo, titulo, genero,
+ano_lancamento, elenco (lista ou texto separado por vírgulas), duracao_minutos
+(filmes), status_visualizacao, avaliacao e, para séries, temporadas:
+[{"numero", "titulo", "episodios": [{"numero", "nome", "duracao_minutos"}]}].
+
+Formato CSV: as mesmas colunas simples, mais as colunas opcionais
+temporada_numero, temporada_titulo, episodio_numero, episodio_nome e
+episodio_duracao. Linhas consecutivas de uma mesma série (tipo SERIE, mesmo
+título e ano) são agrupadas, uma linha por episódio. A coluna elenco aceita
+uma lista JSON (["Ator A", "X, Jr."], como grava o exportador) ou texto
+separado por vírgulas.
+
+Uso: python importador.py arquivo.jsonl [--db dados.db] [--formato csv|jsonl]
+     [--perfil padrao|producao]
+"""
+import argparse
+import csv
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from catalogo import Catalogo
+from conexao import PERFIS
+from midia import Episodio, Midia, StatusVisualizacao, Temporada, TipoMidia
+from midia_concreta import Filme, Serie
+
+
+# Quantidade máxima de rejeições guardadas com detalhes no relatório; as
+# demais são apenas contadas.
+LIMITE_REJEICOES_DETALHADAS = 100
+
+Registro = Tuple[int, Dict[str, Any]]
+
+
+class RelatorioImportacao:
+
+    def __init__(self):
+        self.lidos = 0
+        self.importados = 0
+        self.total_rejeitados = 0
+        self.rejeitados: List[Tuple[int, str]] = []
+        self.segundos = 0.0
+
+    def rejeitar(self, linha: int, motivo: str):
+
+        self.total_rejeitados += 1
+        if len(self.rejeitados) < LIMITE_REJEICOES_DETALHADAS:
+            self.rejeitados.append((linha, motivo))
+
+    @property
+    def por_segundo(self) -> float:
+
+        return self.importados / self.segundos if self.segundos > 0 else 0.0
+
+    def __str__(self) -> str:
+
+        linhas = [
+            f"Registros lidos: {self.lidos}",
+            f"Mídias importadas: {self.importados} em {self.segundos:.2f}s "
+            f"({self.por_segundo:.0f} mídias/s)",
+            f"Registros rejeitados: {self.total_rejeitados}",
+        ]
+        for linha, motivo in self.rejeitados:
+            linhas.append(f"  - linha {linha}: {motivo}")
+        if self.total_rejeitados > len(self.rejeitados):
+            linhas.append(
+                f"  ... e mais {self.total_rejeitados - len(self.rejeitados)} rejeições.")
+        return "\n".join(linhas)
+
+
+def ler_jsonl(caminho: Path) -> Iterator[Registro]:
+
+    with open(caminho, encoding="utf-8") as arquivo:
+        for num_linha, linha in enumerate(arquivo, 1):
+            if not linha.strip():
+                continue
+            try:
+                registro = json.loads(linha)
+            except json.JSONDecodeError as e:
+                yield num_linha, {"_erro": f"JSON inválido: {e.msg}"}
+                continue
+            if not isinstance(registro, dict):
+                registro = {"_erro": "A linha deve conter um objeto JSON."}
+            yield num_linha, registro
+
+
+def ler_csv(caminho: Path) -> Iterator[Registro]:
+
+    with open(caminho, encoding="utf-8", newline="") as arquivo:
+        leitor = csv.DictReader(arquivo)
+        serie_atual: Optional[Dict[str, Any]] = None
+        linha_serie = 0
+
+        for linha in leitor:
+            num_linha = leitor.line_num
+            registro = {k.strip(): (v.strip() if isinstance(v, str) else v)
+                        for k, v in linha.items() if k}
+            tipo = (registro.get("tipo") or "").upper()
+
+            if tipo == TipoMidia.SERIE.name:
+                chave = (registro.get("titulo"), registro.get("ano_lancamento"))
+                if serie_atual is None or chave != (serie_atual.get("titulo"), serie_atual.get("ano_lancamento")):
+                    if serie_atual is not None:
+                        yield linha_serie, serie_atual
+                    serie_atual = dict(registro, temporadas=[])
+                    linha_serie = num_linha
+                _agrupar_episodio_csv(serie_atual, registro)
+                continue
+
+            if serie_atual is not None:
+                yield linha_serie, serie_atual
+                serie_atual = None
+            yield num_linha, registro
+
+        if serie_atual is not None:
+            yield linha_serie, serie_atual
+
+
+def _agrupar_episodio_csv(serie: Dict[str, Any], registro: Dict[str, Any]):
+
+    if not registro.get("temporada_numero"):
+        return
+
+    temporadas = serie["temporadas"]
+    if not temporadas or str(temporadas[-1]["numero"]) != registro["temporada_numero"]:
+        temporadas.append({
+            "numero": registro["temporada_numero"],
+            "titulo": registro.get("temporada_titulo") or f"Temporada {registro['temporada_numero']}",
+            "episodios": [],
+        })
+
+    if registro.get("episodio_numero"):
+        temporadas[-1]["episodios"].append({
+            "numero": registro["episodio_numero"],
+            "nome": registro.get("episodio_nome") or "",
+            "duracao_minutos": registro.get("episodio_duracao"),
+        })
+
+
+def _status(valor: Any) -> StatusVisualizacao:
+
+    if not valor:
+        return StatusVisualizacao.PENDENTE
+    for status in StatusVisualizacao:
+        if valor in (status.name, status.value):
+            return status
+    raise ValueError(f"Status de visualização desconhecido: {valor}.")
+
+
+def _texto(registro: Dict[str, Any], campo: str) -> Optional[str]:
+
+    # Linhas JSON podem trazer qualquer tipo; só texto (ou ausência) é aceito.
+    valor = registro.get(campo)
+    if valor is not None and not isinstance(valor, str):
+        raise TypeError(f"O campo {campo!r} deve ser texto, não {type(valor).__name__}.")
+    return valor
+
+
+def _lista_de_objetos(valor: Any, campo: str) -> List[Dict[str, Any]]:
+
+    if valor is None:
+        return []
+    if not isinstance(valor, list) or not all(isinstance(item, dict) for item in valor):
+        raise TypeError(f"O campo {campo!r} deve ser uma lista de objetos.")
+    return valor
+
+
+def _elenco(valor: Any) -> List[str]:
+
+    if isinstance(valor, list):
+        return [str(ator).strip() for ator in valor if str(ator).strip()]
+    if valor is not None and not isinstance(valor, str):
+        raise TypeError(f"O elenco deve ser uma lista ou texto, não {type(valor).__name__}.")
+    if valor and valor.lstrip().startswith('['):
+        try:
+            atores = json.loads(valor)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Elenco em JSON inválido: {e}.")
+        if not isinstance(atores, list):
+            raise TypeError("O elenco em JSON deve ser uma lista.")
+        return _elenco(atores)
+    return [ator.strip() for ator in (valor or "").split(',') if ator.strip()]
+
+
+def construir_midia(registro: Dict[str, Any]) -> Midia:
+    """Cria o Filme ou a Serie do registro; os construtores fazem a validação."""
+
+    if "_erro" in registro:
+        raise ValueError(registro["_erro"])
+
+    tipo = (_texto(registro, "tipo") or "").upper()
+    titulo = _texto(registro, "titulo")
+    genero = _texto(registro, "genero")
+    ano = int(registro.get("ano_lancamento") or 0)
+    elenco = _elenco(registro.get("elenco"))
+    status = _status(registro.get("status_visualizacao"))
+    avaliacao = float(registro.get("avaliacao") or 0.0)
+
+    if tipo == TipoMidia.FILME.name:
+        return Filme(titulo, genero, ano, int(registro.get("duracao_minutos") or 0), elenco,
+                     status=status, avaliacao=avaliacao)
+
+    if tipo == TipoMidia.SERIE.name:
+        serie = Serie(titulo, genero, ano, elenco,
+                      status=status, avaliacao=avaliacao)
+        for dados_temp in _lista_de_objetos(registro.get("temporadas"), "temporadas"):
+            temporada = Temporada(int(dados_temp["numero"]),
+                                  _texto(dados_temp, "titulo") or "")
+            for dados_ep in _lista_de_objetos(dados_temp.get("episodios"), "episodios"):
+                temporada.adicionar_episodio(Episodio(
+                    int(dados_ep["numero"]), _texto(dados_ep, "nome") or "",
+                    int(dados_ep.get("duracao_minutos") or 0)))
+            if any(t.numero == temporada.numero for t in serie.temporadas):
+                raise ValueError(
+                    f"A temporada {temporada.numero} aparece mais de uma vez.")
+            serie.adicionar_temporada(temporada)
+        return serie
+
+    raise ValueError(f"Tipo de mídia desconhecido: {registro.get('tipo')!r}.")
+
+
+def validar(registros: Iterable[Registro], relatorio: RelatorioImportacao) -> Iterator[Midia]:
+
+    for num_linha, registro in registros:
+        relatorio.lidos += 1
+        try:
+            yield construir_midia(registro)
+        except (ValueError, TypeError, KeyError, AttributeError) as e:
+            relatorio.rejeitar(num_linha, str(e))
+
+
+def importar(catalogo: Catalogo, caminho: Path, formato: Optional[str] = None,
+             tamanho_lote: int = 1000) -> RelatorioImportacao:
+
+    caminho = Path(caminho)
+    formato = (formato or caminho.suffix.lstrip(".")).lower()
+    if formato in ("jsonl", "ndjson", "json"):
+        registros = ler_jsonl(caminho)
+    elif formato == "csv":
+        registros = ler_csv(caminho)
+    else:
+        raise ValueError(f"Formato de arquivo não suportado: {formato!r}.")
+
+    relatorio = RelatorioImportacao()
+    inicio = time.perf_counter()
+    # Confirmar a cada lote evita acumular as mídias da transação inteira.
+    relatorio.importados = catalogo.adicionar_midias_em_lote(
+        validar(registros, relatorio), tamanho_lote=tamanho_lote,
+        commit_a_cada=tamanho_lote)
+    relatorio.segundos = time.perf_counter() - inicio
+    return relatorio
+
+
+def main(argv: Optional[List[str]] = None):
+
+    parser = argparse.ArgumentParser(
+        description="Importa filmes e séries de um arquivo CSV ou JSON-lines.")
+    parser.add_argument("arquivo", type=Path)
+    parser.add_argument("--db", type=Path, default=Path("dados.db"))
+    parser.add_argument("--perfil", choices=sorted(PERFIS), default="producao")
+    parser.add_argument("--formato", choices=["csv", "jsonl"])
+    parser.add_argument("--lote", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    catalogo = Catalogo(db_path=args.db, carregar=False, perfil=args.perfil)
+    try:
+        relatorio = importar(catalogo, args.arquivo, args.formato, args.lote)
+    finally:
+        catalogo.fechar_conexao()
+    print(relatorio)
+    return 0 if relatorio.total_rejeitados == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
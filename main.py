@@ -9,10 +9,13 @@ from pathlib import Path
 
 
 DB_PATH = Path("dados.db")
+TAMANHO_PAGINA = 10
 
 try:
 
-    catalogo = Catalogo(db_path=DB_PATH)
+    # O catálogo completo só é carregado pelos menus que precisam dele; a
+    # listagem paginada lê apenas a página exibida.
+    catalogo = Catalogo(db_path=DB_PATH, carregar=False, perfil="producao")
 except Exception as e:
     print(f"Não foi possível inicializar o Catálogo: {e}")
     sys.exit(1)
@@ -99,6 +102,9 @@ def exibir_midias(midias_list: List[Midia]):
         print("\nO catálogo está vazio ou não foram encontrados resultados.\n")
         return
 
+    # Uma leitura para as temporadas de todas as séries listadas.
+    catalogo.pre_carregar_temporadas(midias_list)
+
     print("\n--- CATÁLOGO DE MÍDIAS ---\n")
     for midia in midias_list:
         print(f"ID: {midia.id} | {midia.tipo.value}")
@@ -124,6 +130,72 @@ def exibir_midias(midias_list: List[Midia]):
     print()
 
 
+def escolher_filtros():
+
+    filtros = {'tipo': None, 'status': None, 'genero': None}
+
+    tipo = input_limpo("Tipo (F = Filme, S = Série, ENTER = todos): ").upper()
+    if tipo == 'F':
+        filtros['tipo'] = TipoMidia.FILME
+    elif tipo == 'S':
+        filtros['tipo'] = TipoMidia.SERIE
+
+    print("Status: " + ", ".join(f"{i}. {s.value}" for i, s in enumerate(StatusVisualizacao, 1)))
+    status = input_limpo("Número do status (ENTER = todos): ")
+    if status.isdigit() and 1 <= int(status) <= len(StatusVisualizacao):
+        filtros['status'] = list(StatusVisualizacao)[int(status) - 1]
+
+    genero = input_limpo("Gênero (ENTER = todos): ")
+    filtros['genero'] = genero or None
+    return filtros
+
+
+def menu_navegar_catalogo():
+
+    tamanho = TAMANHO_PAGINA
+    filtros = {'tipo': None, 'status': None, 'genero': None}
+    pagina = catalogo.pagina_midias(tamanho, **filtros)
+    numero = 1
+
+    while True:
+        limpar_tela()
+        exibir_midias(pagina.midias)
+        print(f"Página {numero} ({len(pagina.midias)} mídias, até {tamanho} por página)")
+
+        opcoes = []
+        if pagina.tem_anterior:
+            opcoes.append("[A] Anterior")
+        if pagina.tem_proxima:
+            opcoes.append("[P] Próxima")
+        opcoes += ["[F] Filtros", "[T] Tamanho da página", "[0] Voltar"]
+        escolha = input_limpo(" | ".join(opcoes) + ": ").upper()
+
+        if escolha == 'P' and pagina.tem_proxima:
+            pagina = catalogo.pagina_midias(tamanho, apos=pagina.ultima, **filtros)
+            numero += 1
+        elif escolha == 'A' and pagina.tem_anterior:
+            pagina = catalogo.pagina_midias(tamanho, antes=pagina.primeira, **filtros)
+            numero = numero - 1 if pagina.tem_anterior else 1
+        elif escolha == 'F':
+            filtros = escolher_filtros()
+            pagina = catalogo.pagina_midias(tamanho, **filtros)
+            numero = 1
+        elif escolha == 'T':
+            try:
+                novo_tamanho = int(input_limpo("Mídias por página: "))
+                if novo_tamanho <= 0:
+                    raise ValueError
+            except ValueError:
+                print("Tamanho inválido.")
+                input("Pressione ENTER para continuar.")
+                continue
+            tamanho = novo_tamanho
+            pagina = catalogo.pagina_midias(tamanho, **filtros)
+            numero = 1
+        elif escolha == '0':
+            return
+
+
 def menu_atualizar_status_avaliacao():
 
     limpar_tela()
@@ -141,8 +213,7 @@ def menu_atualizar_status_avaliacao():
             if midia_id == 0:
                 return
 
-            midia = next(
-                (m for m in catalogo.midias if m.id == midia_id), None)
+            midia = catalogo.obter_midia_por_id(midia_id)
             if not midia:
                 print("ID não encontrado. Tente novamente.")
                 continue
@@ -195,6 +266,7 @@ def menu_atualizar_status_avaliacao():
 def menu_adicionar_episodio():
 
     limpar_tela()
+    catalogo.carregar_midias()
     series = [m for m in catalogo.midias if m.tipo == TipoMidia.SERIE]
 
     if not series:
@@ -213,7 +285,7 @@ def menu_adicionar_episodio():
             if serie_id == 0:
                 return
 
-            serie = next((s for s in series if s.id == serie_id), None)
+            serie = catalogo.buscar_serie_por_id(serie_id)
             if not serie:
                 print("ID da Série não encontrado. Tente novamente.")
                 continue
@@ -257,8 +329,9 @@ def menu_adicionar_episodio():
     try:
         novo_episodio = Episodio(num_episodio, nome_episodio, duracao)
 
-        catalogo.adicionar_episodio_em_temporada(
-            serie_id, num_temporada, novo_episodio)
+        # Cria a temporada caso ela ainda não exista.
+        catalogo.adicionar_episodios(
+            serie_id, num_temporada, [novo_episodio])
         print(
             f"\n[SUCESSO] Episódio E{num_episodio} na T{num_temporada} de '{serie.titulo}' adicionado.\n")
     except Exception as e:
@@ -284,8 +357,7 @@ def menu_remover_midia():
             if midia_id == 0:
                 return
 
-            midia_para_remover = next(
-                (m for m in catalogo.midias if m.id == midia_id), None)
+            midia_para_remover = catalogo.obter_midia_por_id(midia_id)
             if not midia_para_remover:
                 print("ID não encontrado. Tente novamente.")
                 continue
@@ -399,6 +471,21 @@ def menu_relatorio():
     input("Pressione ENTER para voltar ao menu principal.")
 
 
+def menu_buscar():
+
+    limpar_tela()
+    print("--- BUSCAR NO CATÁLOGO ---")
+    texto = input_limpo(
+        "Buscar por título, gênero, elenco ou episódio (ou ENTER para voltar): ")
+    if not texto:
+        return
+
+    resultados = catalogo.buscar(texto)
+    print(f"\n{len(resultados)} resultado(s) para '{texto}'.")
+    exibir_midias(resultados)
+    input("Pressione ENTER para voltar ao menu principal.")
+
+
 def menu_principal():
 
     while True:
@@ -406,22 +493,20 @@ def menu_principal():
         print("=" * 40)
         print("   CATÁLOGO DE MÍDIAS PESSOAL V2")
         print("=" * 40)
-        print("1. Visualizar Catálogo Completo")
+        print("1. Navegar pelo Catálogo (paginado)")
         print("2. Adicionar Nova Mídia (Filme/Série)")
         print("3. Atualizar Status e Avaliação de Mídia")
         print("4. Adicionar Episódio a uma Série")
         print("5. Remover Mídia do Catálogo")
         print("6. Gerar Relatório de Estatísticas")
+        print("7. Buscar no Catálogo")
         print("0. Sair e Fechar")
         print("-" * 40)
 
         escolha = input_limpo("Escolha uma opção: ")
 
         if escolha == '1':
-            limpar_tela()
-            catalogo.carregar_midias()
-            exibir_midias(catalogo.midias)
-            input("Pressione ENTER para voltar ao menu principal.")
+            menu_navegar_catalogo()
         elif escolha == '2':
             menu_adicionar_midia()
         elif escolha == '3':
@@ -432,6 +517,8 @@ def menu_principal():
             menu_remover_midia()
         elif escolha == '6':
             menu_relatorio()
+        elif escolha == '7':
+            menu_buscar()
         elif escolha == '0':
             print("\nSalvando alterações e fechando o catálogo. Até mais!")
             catalogo.fechar_conexao()
@@ -1,5 +1,6 @@
+from array import array
 from enum import Enum
-from typing import List, Optional, Union
+from typing import Iterable, Iterator, List, Optional, Set, Tuple, Union
 import uuid
 
 
@@ -19,6 +20,10 @@ class StatusVisualizacao(Enum):
 
 class Midia:
 
+    # Sem __dict__ por instância: catálogos grandes hidratam muitos objetos.
+    __slots__ = ("_id", "_uuid", "titulo", "genero", "ano_lancamento", "elenco",
+                 "tipo", "_status_visualizacao", "_avaliacao")
+
     def __init__(
         self,
         titulo: str,
@@ -33,7 +38,8 @@ class Midia:
 
         self._id: Optional[int] = id
 
-        self.uuid: str = str(uuid.uuid4())
+        # Gerado apenas no primeiro acesso à propriedade uuid.
+        self._uuid: Optional[str] = None
 
         if not titulo or not genero or not ano_lancamento:
             raise ValueError(
@@ -70,6 +76,13 @@ class Midia:
 
             pass
 
+    @property
+    def uuid(self) -> str:
+
+        if self._uuid is None:
+            self._uuid = str(uuid.uuid4())
+        return self._uuid
+
     @property
     def status_visualizacao(self) -> StatusVisualizacao:
 
@@ -132,6 +145,8 @@ class Midia:
 
 class Episodio:
 
+    __slots__ = ("_id", "numero", "nome", "duracao_minutos")
+
     def __init__(self, numero: int, nome: str, duracao_minutos: int, id: Optional[int] = None):
 
         if numero <= 0 or duracao_minutos <= 0:
@@ -169,9 +184,113 @@ class Episodio:
         return f"E{self.numero}: {self.nome} ({self.duracao_minutos} min)"
 
 
+class EpisodiosColunares:
+    """Episódios de uma temporada guardados em colunas, sem um objeto por episódio.
+
+    Números, durações e ids ficam em arrays e os nomes numa lista; iterar ou
+    indexar devolve visões Episodio criadas na hora, cujas alterações são
+    gravadas de volta nas colunas.
+    """
+
+    __slots__ = ("_ids", "_numeros", "_duracoes", "_nomes")
+
+    def __init__(self, episodios: Iterable[Episodio] = ()):
+
+        # Id 0 representa um episódio ainda não salvo.
+        self._ids = array("q")
+        self._numeros = array("l")
+        self._duracoes = array("l")
+        self._nomes: List[str] = []
+        for episodio in episodios:
+            self.append(episodio)
+
+    def anexar(self, numero: int, nome: str, duracao_minutos: int, id: Optional[int] = None):
+
+        self._ids.append(id or 0)
+        self._numeros.append(numero)
+        self._duracoes.append(duracao_minutos)
+        self._nomes.append(nome)
+
+    def append(self, episodio: Episodio):
+
+        self.anexar(episodio.numero, episodio.nome,
+                    episodio.duracao_minutos, episodio._id)
+
+    @property
+    def numeros(self) -> array:
+
+        return self._numeros
+
+    @property
+    def duracao_total(self) -> int:
+
+        return sum(self._duracoes)
+
+    def __len__(self) -> int:
+        return len(self._numeros)
+
+    def __getitem__(self, posicao: int) -> Episodio:
+
+        if posicao < 0:
+            posicao += len(self)
+        if not 0 <= posicao < len(self):
+            raise IndexError("Posição de episódio fora do intervalo.")
+        return _EpisodioColunar(self, posicao)
+
+    def __iter__(self) -> Iterator[Episodio]:
+
+        for posicao in range(len(self)):
+            yield _EpisodioColunar(self, posicao)
+
+
+class _EpisodioColunar(Episodio):
+
+    __slots__ = ("_colunas", "_posicao")
+
+    def __init__(self, colunas: EpisodiosColunares, posicao: int):
+
+        self._colunas = colunas
+        self._posicao = posicao
+
+    @property
+    def _id(self) -> Optional[int]:
+        return self._colunas._ids[self._posicao] or None
+
+    @_id.setter
+    def _id(self, value: Optional[int]):
+        self._colunas._ids[self._posicao] = value or 0
+
+    @property
+    def numero(self) -> int:
+        return self._colunas._numeros[self._posicao]
+
+    @numero.setter
+    def numero(self, value: int):
+        self._colunas._numeros[self._posicao] = value
+
+    @property
+    def nome(self) -> str:
+        return self._colunas._nomes[self._posicao]
+
+    @nome.setter
+    def nome(self, value: str):
+        self._colunas._nomes[self._posicao] = value
+
+    @property
+    def duracao_minutos(self) -> int:
+        return self._colunas._duracoes[self._posicao]
+
+    @duracao_minutos.setter
+    def duracao_minutos(self, value: int):
+        self._colunas._duracoes[self._posicao] = value
+
+
 class Temporada:
 
-    def __init__(self, numero: int, titulo: str, episodios: Optional[List[Episodio]] = None, id: Optional[int] = None):
+    __slots__ = ("_id", "numero", "titulo", "episodios", "_totais", "_serie", "_numeros_episodios")
+
+    def __init__(self, numero: int, titulo: str, episodios: Optional[List[Episodio]] = None, id: Optional[int] = None,
+                 colunar: bool = False):
 
         if numero <= 0:
             raise ValueError("O número da temporada deve ser positivo.")
@@ -179,8 +298,19 @@ class Temporada:
         self._id: Optional[int] = id
         self.numero: int = numero
         self.titulo: str = titulo
-        self.episodios: List[Episodio] = episodios if episodios is not None else [
-        ]
+        # Com colunar=True, os episódios ficam em EpisodiosColunares, mais
+        # compacto para temporadas longas.
+        if colunar:
+            self.episodios: Union[List[Episodio], EpisodiosColunares] = EpisodiosColunares(
+                episodios or ())
+        else:
+            self.episodios = episodios if episodios is not None else []
+        # Totais (episódios, minutos) calculados sob demanda e a série dona da
+        # temporada, avisada quando eles mudam.
+        self._totais: Optional[Tuple[int, int]] = None
+        self._serie = None
+        # Números já usados, montado no primeiro adicionar_episodio.
+        self._numeros_episodios: Optional[Set[int]] = None
 
     @property
     def id(self) -> Optional[int]:
@@ -200,11 +330,45 @@ class Temporada:
         if not isinstance(episodio, Episodio):
             raise TypeError("O objeto deve ser uma instância de Episodio.")
 
-        if any(e.numero == episodio.numero for e in self.episodios):
+        if self._numeros_episodios is None:
+            if isinstance(self.episodios, EpisodiosColunares):
+                self._numeros_episodios = set(self.episodios.numeros)
+            else:
+                self._numeros_episodios = {e.numero for e in self.episodios}
+
+        if episodio.numero in self._numeros_episodios:
             raise ValueError(
                 f"O episódio número {episodio.numero} já existe na T{self.numero}.")
 
         self.episodios.append(episodio)
+        self._numeros_episodios.add(episodio.numero)
+        self._invalidar_totais()
+
+    def _invalidar_totais(self):
+
+        self._totais = None
+        if self._serie is not None:
+            self._serie._invalidar_totais()
+
+    def _calcular_totais(self) -> Tuple[int, int]:
+
+        if self._totais is None:
+            if isinstance(self.episodios, EpisodiosColunares):
+                duracao = self.episodios.duracao_total
+            else:
+                duracao = sum(e.duracao_minutos for e in self.episodios)
+            self._totais = (len(self.episodios), duracao)
+        return self._totais
+
+    @property
+    def total_episodios(self) -> int:
+
+        return self._calcular_totais()[0]
+
+    @property
+    def duracao_total(self) -> int:
+
+        return self._calcular_totais()[1]
 
     def to_dict(self) -> dict:
 
@@ -217,5 +381,4 @@ class Temporada:
         }
 
     def __str__(self) -> str:
-        total_eps = len(self.episodios)
-        return f"T{self.numero}: {self.titulo} ({total_eps} episódios)"
+        return f"T{self.numero}: {self.titulo} ({self.total_episodios} episódios)"
@@ -1,10 +1,12 @@
-from typing import List, Optional
+from typing import Callable, List, Optional, Tuple
 from midia import Midia, TipoMidia, StatusVisualizacao, Temporada
 
 
 class Filme(Midia):
     """Representa um Filme, estendendo a classe base Midia."""
 
+    __slots__ = ("_duracao_minutos",)
+
     def __init__(self,
                  titulo: str,
                  genero: str,
@@ -31,6 +33,12 @@ class Filme(Midia):
             raise ValueError("A duração deve ser um número positivo.")
         self._duracao_minutos = int(nova_duracao)
 
+    def to_dict(self) -> dict:
+        """Dicionário da mídia incluindo a duração do filme."""
+        data = super().to_dict()
+        data['duracao_minutos'] = self.duracao_minutos
+        return data
+
     def __str__(self):
         """Representação em string do Filme."""
         base_str = super().__str__()
@@ -40,6 +48,8 @@ class Filme(Midia):
 class Serie(Midia):
     """Representa uma Série, estendendo a classe base Midia e gerenciando Temporadas."""
 
+    __slots__ = ("_temporadas", "_carregador", "_resumo")
+
     def __init__(self,
                  titulo: str,
                  genero: str,
@@ -50,7 +60,45 @@ class Serie(Midia):
                  id: Optional[int] = None):
         super().__init__(titulo, genero, ano_lancamento,
                          elenco, TipoMidia.SERIE, id, status, avaliacao)
-        self.temporadas: List[Temporada] = []
+        self._temporadas: Optional[List[Temporada]] = []
+        # Carregamento tardio: função que preenche as temporadas no primeiro
+        # acesso. O resumo (temporadas, episódios, minutos) vem do banco até lá
+        # e, com a árvore em memória, é calculado uma vez e mantido em cache.
+        self._carregador: Optional[Callable[["Serie"], None]] = None
+        self._resumo: Optional[Tuple[int, int, int]] = None
+
+    @property
+    def temporadas(self) -> List[Temporada]:
+        """Temporadas da série, carregadas do banco no primeiro acesso se necessário."""
+        if self._temporadas is None:
+            # O carregador atribui a lista já montada pelo setter; até lá a
+            # série segue como não carregada, então outra thread que a leia ao
+            # mesmo tempo carrega de novo em vez de ver uma lista vazia.
+            if self._carregador is not None:
+                self._carregador(self)
+            if self._temporadas is None:
+                self._temporadas = []
+        return self._temporadas
+
+    @temporadas.setter
+    def temporadas(self, temporadas: List[Temporada]):
+        for temporada in temporadas:
+            temporada._serie = self
+        self._temporadas = temporadas
+        self._carregador = None
+        self._resumo = None
+
+    @property
+    def temporadas_carregadas(self) -> bool:
+        """Indica se a árvore de temporadas já está em memória."""
+        return self._temporadas is not None
+
+    def definir_carregamento_tardio(self, carregador: Callable[["Serie"], None],
+                                    resumo: Tuple[int, int, int]):
+        """Adia a leitura das temporadas até o primeiro acesso a `temporadas`."""
+        self._temporadas = None
+        self._carregador = carregador
+        self._resumo = resumo
 
     def adicionar_temporada(self, temporada: Temporada):
         """Adiciona uma temporada à lista da série."""
@@ -59,23 +107,49 @@ class Serie(Midia):
                 "Apenas objetos da classe Temporada podem ser adicionados.")
         self.temporadas.append(temporada)
         self.temporadas.sort(key=lambda t: t.numero)
+        temporada._serie = self
+        self._resumo = None
+
+    def _invalidar_totais(self):
+        """Descarta o resumo em cache; chamado quando a árvore em memória muda."""
+        if self._temporadas is not None:
+            self._resumo = None
+
+    def _calcular_totais(self) -> Tuple[int, int, int]:
+        if self._resumo is None:
+            temporadas = self.temporadas
+            self._resumo = (len(temporadas),
+                            sum(t.total_episodios for t in temporadas),
+                            sum(t.duracao_total for t in temporadas))
+        return self._resumo
+
+    @property
+    def total_temporadas(self) -> int:
+        """Retorna o número de temporadas, sem carregar a árvore se o resumo for conhecido."""
+        return self._calcular_totais()[0]
+
+    @property
+    def total_episodios(self) -> int:
+        """Retorna o número total de episódios da série."""
+        return self._calcular_totais()[1]
 
     @property
     def duracao_total(self) -> int:
         """Retorna a duração total de todos os episódios."""
-        total = 0
-        for temporada in self.temporadas:
-            for episodio in temporada.episodios:
-                total += episodio.duracao_minutos
-        return total
+        return self._calcular_totais()[2]
+
+    def to_dict(self) -> dict:
+        """Dicionário da mídia incluindo a árvore de temporadas e episódios."""
+        data = super().to_dict()
+        data['temporadas'] = [t.to_dict() for t in self.temporadas]
+        return data
 
     def __str__(self):
         """Representação em string da Série, incluindo contagem de temporadas/episódios."""
         base_str = super().__str__()
-        total_episodios = sum(len(t.episodios) for t in self.temporadas)
 
-        info_str = (f"  Temporadas: {len(self.temporadas)} | "
-                    f"Episódios Totais: {total_episodios} | "
+        info_str = (f"  Temporadas: {self.total_temporadas} | "
+                    f"Episódios Totais: {self.total_episodios} | "
                     f"Duração Total: {self.duracao_total} min")
 
         return f"{base_str.strip()}\n{info_str}"
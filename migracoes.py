@@ -0,0 +1,557 @@
+import sqlite3
+from typing import Callable, List, Tuple
+
+
+# Cada migração leva o schema da versão anterior para a sua. A versão aplicada
+# fica em PRAGMA user_version; bancos antigos (versão 0) são atualizados no
+# lugar, e cada passo roda numa transação própria.
+
+
+def _v1_schema_inicial(cursor: sqlite3.Cursor):
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS Midia (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            titulo TEXT NOT NULL,
+            genero TEXT,
+            ano_lancamento INTEGER,
+            elenco TEXT,
+            duracao_minutos INTEGER DEFAULT 0,
+            tipo_midia TEXT NOT NULL,
+            status_visualizacao TEXT NOT NULL,
+            avaliacao REAL DEFAULT 0.0
+        );
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS Temporada (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            serie_id INTEGER,
+            numero INTEGER NOT NULL,
+            nome TEXT,
+            FOREIGN KEY (serie_id) REFERENCES Midia (id)
+        );
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS Episodio (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            temporada_id INTEGER,
+            numero INTEGER NOT NULL,
+            nome TEXT,
+            duracao_minutos INTEGER,
+            FOREIGN KEY (temporada_id) REFERENCES Temporada (id)
+        );
+    """)
+
+
+def _v2_log_alteracoes(cursor: sqlite3.Cursor):
+
+    # Log de alterações alimentado por triggers, usado pela recarga
+    # incremental para saber quais mídias mudaram em outras conexões.
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS Alteracao (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            midia_id INTEGER
+        );
+    """)
+
+    for evento, linha in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")):
+        nome = evento.lower()
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS alteracao_midia_{nome} AFTER {evento} ON Midia
+            BEGIN
+                INSERT INTO Alteracao (midia_id) VALUES ({linha}.id);
+            END;
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS alteracao_temporada_{nome} AFTER {evento} ON Temporada
+            BEGIN
+                INSERT INTO Alteracao (midia_id) VALUES ({linha}.serie_id);
+            END;
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS alteracao_episodio_{nome} AFTER {evento} ON Episodio
+            BEGIN
+                INSERT INTO Alteracao (midia_id)
+                SELECT serie_id FROM Temporada WHERE id = {linha}.temporada_id;
+            END;
+        """)
+
+
+def _v3_indices(cursor: sqlite3.Cursor):
+
+    # Episódios repetidos na mesma temporada impediriam o índice único; em vez
+    # de descartá-los, são renumerados para o fim da temporada.
+    duplicados = cursor.execute("""
+        SELECT e.id, e.temporada_id
+        FROM Episodio e
+        WHERE EXISTS (
+            SELECT 1 FROM Episodio o
+            WHERE o.temporada_id = e.temporada_id AND o.numero = e.numero AND o.id < e.id
+        )
+        ORDER BY e.temporada_id, e.id
+    """).fetchall()
+
+    for episodio_id, temporada_id in duplicados:
+        cursor.execute("""
+            UPDATE Episodio
+            SET numero = (SELECT MAX(numero) + 1 FROM Episodio WHERE temporada_id IS ?)
+            WHERE id = ?
+        """, (temporada_id, episodio_id))
+        print(f"Aviso: episódio {episodio_id} tinha número repetido na temporada "
+              f"{temporada_id} e foi renumerado.")
+
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_temporada_serie ON Temporada (serie_id, numero)")
+    # O índice único também atende às buscas por temporada_id (prefixo).
+    cursor.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_episodio_temporada_numero ON Episodio (temporada_id, numero)")
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_midia_tipo ON Midia (tipo_midia)")
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_midia_status ON Midia (status_visualizacao)")
+
+
+def _v4_indices_estatisticas(cursor: sqlite3.Cursor):
+
+    # Índices de cobertura para o relatório calculado no SQL (estatisticas.py).
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_midia_estatisticas
+        ON Midia (genero, tipo_midia, status_visualizacao, avaliacao, duracao_minutos)
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_midia_ranking
+        ON Midia (tipo_midia, status_visualizacao, avaliacao DESC, titulo)
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_episodio_duracao
+        ON Episodio (temporada_id, duracao_minutos)
+    """)
+
+
+def _v5_indices_ranking(cursor: sqlite3.Cursor):
+
+    # Rankings por gênero e por década (ranking.py), já na ordem de desempate.
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_midia_ranking_genero
+        ON Midia (genero, tipo_midia, status_visualizacao, avaliacao DESC, titulo)
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_midia_ranking_decada
+        ON Midia (tipo_midia, status_visualizacao, (ano_lancamento / 10), avaliacao DESC, titulo)
+    """)
+
+
+def _v6_busca_textual(cursor: sqlite3.Cursor):
+
+    # Índice FTS5 de busca (rowid = Midia.id). O tokenizador remove acentos e
+    # o índice de prefixos atende às buscas por termos incompletos.
+    cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS MidiaBusca USING fts5(
+            titulo, genero, elenco, episodios,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        );
+    """)
+
+    cursor.execute("""
+        INSERT INTO MidiaBusca (rowid, titulo, genero, elenco, episodios)
+        SELECT m.id, m.titulo, m.genero, m.elenco,
+               COALESCE((SELECT group_concat(e.nome, ' ')
+                         FROM Temporada t JOIN Episodio e ON e.temporada_id = t.id
+                         WHERE t.serie_id = m.id), '')
+        FROM Midia m
+    """)
+
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS busca_midia_insert AFTER INSERT ON Midia
+        BEGIN
+            INSERT INTO MidiaBusca (rowid, titulo, genero, elenco, episodios)
+            VALUES (NEW.id, NEW.titulo, NEW.genero, NEW.elenco, '');
+        END;
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS busca_midia_update AFTER UPDATE OF titulo, genero, elenco ON Midia
+        BEGIN
+            UPDATE MidiaBusca SET titulo = NEW.titulo, genero = NEW.genero, elenco = NEW.elenco
+            WHERE rowid = NEW.id;
+        END;
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS busca_midia_delete AFTER DELETE ON Midia
+        BEGIN
+            DELETE FROM MidiaBusca WHERE rowid = OLD.id;
+        END;
+    """)
+
+    # Episódios novos são acrescentados ao texto da série; alterações e
+    # remoções recompõem o texto a partir da tabela Episodio.
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS busca_episodio_insert AFTER INSERT ON Episodio
+        BEGIN
+            UPDATE MidiaBusca SET episodios = episodios || ' ' || COALESCE(NEW.nome, '')
+            WHERE rowid = (SELECT serie_id FROM Temporada WHERE id = NEW.temporada_id);
+        END;
+    """)
+    for evento, linha in (("UPDATE OF nome, temporada_id", "NEW"), ("DELETE", "OLD")):
+        nome = evento.split()[0].lower()
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS busca_episodio_{nome} AFTER {evento} ON Episodio
+            BEGIN
+                UPDATE MidiaBusca SET episodios = COALESCE((
+                    SELECT group_concat(e.nome, ' ')
+                    FROM Temporada t JOIN Episodio e ON e.temporada_id = t.id
+                    WHERE t.serie_id = MidiaBusca.rowid), '')
+                WHERE rowid = (SELECT serie_id FROM Temporada WHERE id = {linha}.temporada_id);
+            END;
+        """)
+
+
+def _v7_elenco_normalizado(cursor: sqlite3.Cursor):
+
+    # O elenco passa a ser guardado em Ator/MidiaAtor; a coluna Midia.elenco
+    # continua sendo gravada como texto, mas só para a busca textual.
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS Ator (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nome TEXT NOT NULL UNIQUE
+        );
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS MidiaAtor (
+            midia_id INTEGER NOT NULL,
+            ator_id INTEGER NOT NULL,
+            ordem INTEGER NOT NULL,
+            PRIMARY KEY (midia_id, ordem),
+            FOREIGN KEY (midia_id) REFERENCES Midia (id),
+            FOREIGN KEY (ator_id) REFERENCES Ator (id)
+        ) WITHOUT ROWID;
+    """)
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_midia_ator_ator ON MidiaAtor (ator_id, midia_id)")
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_ator_nome_nocase ON Ator (nome COLLATE NOCASE)")
+
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS elenco_midia_delete AFTER DELETE ON Midia
+        BEGIN
+            DELETE FROM MidiaAtor WHERE midia_id = OLD.id;
+        END;
+    """)
+
+    # Converte o texto separado por vírgulas das mídias já cadastradas.
+    elencos = cursor.execute(
+        "SELECT id, elenco FROM Midia WHERE elenco IS NOT NULL AND elenco != ''").fetchall()
+    for midia_id, elenco_str in elencos:
+        nomes = [ator.strip() for ator in elenco_str.split(',') if ator.strip()]
+        for ordem, nome in enumerate(nomes):
+            cursor.execute("INSERT OR IGNORE INTO Ator (nome) VALUES (?)", (nome,))
+            cursor.execute("""
+                INSERT INTO MidiaAtor (midia_id, ator_id, ordem)
+                SELECT ?, id, ? FROM Ator WHERE nome = ?
+            """, (midia_id, ordem, nome))
+
+
+def _v8_totais_desnormalizados(cursor: sqlite3.Cursor):
+
+    # Totais mantidos por triggers, para que relatórios não precisem varrer
+    # Episodio: cada temporada guarda a contagem e a duração dos seus
+    # episódios, e cada série guarda as somas das suas temporadas. Para séries,
+    # Midia.duracao_minutos passa a ser a duração total dos episódios.
+    cursor.execute(
+        "ALTER TABLE Temporada ADD COLUMN total_episodios INTEGER NOT NULL DEFAULT 0")
+    cursor.execute(
+        "ALTER TABLE Temporada ADD COLUMN duracao_total INTEGER NOT NULL DEFAULT 0")
+    cursor.execute(
+        "ALTER TABLE Midia ADD COLUMN total_temporadas INTEGER NOT NULL DEFAULT 0")
+    cursor.execute(
+        "ALTER TABLE Midia ADD COLUMN total_episodios INTEGER NOT NULL DEFAULT 0")
+
+    # As atualizações de totais não devem entrar no log de alterações: a
+    # escrita que as causou (em Episodio ou Temporada) já foi registrada.
+    cursor.execute("DROP TRIGGER IF EXISTS alteracao_midia_update")
+    cursor.execute("DROP TRIGGER IF EXISTS alteracao_temporada_update")
+
+    cursor.execute("""
+        UPDATE Temporada SET
+            total_episodios = (SELECT COUNT(*) FROM Episodio WHERE temporada_id = Temporada.id),
+            duracao_total = (SELECT COALESCE(SUM(duracao_minutos), 0) FROM Episodio WHERE temporada_id = Temporada.id)
+    """)
+    cursor.execute("""
+        UPDATE Midia SET
+            total_temporadas = (SELECT COUNT(*) FROM Temporada WHERE serie_id = Midia.id),
+            total_episodios = (SELECT COALESCE(SUM(total_episodios), 0) FROM Temporada WHERE serie_id = Midia.id),
+            duracao_minutos = (SELECT COALESCE(SUM(duracao_total), 0) FROM Temporada WHERE serie_id = Midia.id)
+        WHERE tipo_midia = 'SERIE'
+    """)
+
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS alteracao_midia_update
+        AFTER UPDATE OF titulo, genero, ano_lancamento, elenco, duracao_minutos,
+                        tipo_midia, status_visualizacao, avaliacao ON Midia
+        WHEN NEW.tipo_midia != 'SERIE' OR OLD.duracao_minutos IS NEW.duracao_minutos
+        BEGIN
+            INSERT INTO Alteracao (midia_id) VALUES (NEW.id);
+        END;
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS alteracao_temporada_update
+        AFTER UPDATE OF serie_id, numero, nome ON Temporada
+        BEGIN
+            INSERT INTO Alteracao (midia_id) VALUES (NEW.serie_id);
+        END;
+    """)
+
+    # Episodio -> Temporada
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS totais_episodio_insert AFTER INSERT ON Episodio
+        BEGIN
+            UPDATE Temporada SET total_episodios = total_episodios + 1,
+                                 duracao_total = duracao_total + COALESCE(NEW.duracao_minutos, 0)
+            WHERE id = NEW.temporada_id;
+        END;
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS totais_episodio_delete AFTER DELETE ON Episodio
+        BEGIN
+            UPDATE Temporada SET total_episodios = total_episodios - 1,
+                                 duracao_total = duracao_total - COALESCE(OLD.duracao_minutos, 0)
+            WHERE id = OLD.temporada_id;
+        END;
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS totais_episodio_update
+        AFTER UPDATE OF temporada_id, duracao_minutos ON Episodio
+        BEGIN
+            UPDATE Temporada SET total_episodios = total_episodios - 1,
+                                 duracao_total = duracao_total - COALESCE(OLD.duracao_minutos, 0)
+            WHERE id = OLD.temporada_id;
+            UPDATE Temporada SET total_episodios = total_episodios + 1,
+                                 duracao_total = duracao_total + COALESCE(NEW.duracao_minutos, 0)
+            WHERE id = NEW.temporada_id;
+        END;
+    """)
+
+    # Temporada -> Midia
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS totais_temporada_insert AFTER INSERT ON Temporada
+        BEGIN
+            UPDATE Midia SET total_temporadas = total_temporadas + 1,
+                             total_episodios = total_episodios + NEW.total_episodios,
+                             duracao_minutos = duracao_minutos + NEW.duracao_total
+            WHERE id = NEW.serie_id;
+        END;
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS totais_temporada_delete AFTER DELETE ON Temporada
+        BEGIN
+            UPDATE Midia SET total_temporadas = total_temporadas - 1,
+                             total_episodios = total_episodios - OLD.total_episodios,
+                             duracao_minutos = duracao_minutos - OLD.duracao_total
+            WHERE id = OLD.serie_id;
+        END;
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS totais_temporada_update
+        AFTER UPDATE OF total_episodios, duracao_total ON Temporada
+        WHEN OLD.serie_id IS NEW.serie_id
+        BEGIN
+            UPDATE Midia SET total_episodios = total_episodios + NEW.total_episodios - OLD.total_episodios,
+                             duracao_minutos = duracao_minutos + NEW.duracao_total - OLD.duracao_total
+            WHERE id = NEW.serie_id;
+        END;
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS totais_temporada_mover
+        AFTER UPDATE OF serie_id ON Temporada
+        WHEN OLD.serie_id IS NOT NEW.serie_id
+        BEGIN
+            UPDATE Midia SET total_temporadas = total_temporadas - 1,
+                             total_episodios = total_episodios - OLD.total_episodios,
+                             duracao_minutos = duracao_minutos - OLD.duracao_total
+            WHERE id = OLD.serie_id;
+            UPDATE Midia SET total_temporadas = total_temporadas + 1,
+                             total_episodios = total_episodios + NEW.total_episodios,
+                             duracao_minutos = duracao_minutos + NEW.duracao_total
+            WHERE id = NEW.serie_id;
+        END;
+    """)
+
+
+def _v9_busca_episodios_adiada(cursor: sqlite3.Cursor):
+
+    # Reescrever o texto de episódios da série a cada episódio inserido deixava
+    # a carga de séries longas quadrática. Os triggers agora só marcam a série
+    # em BuscaPendente; o Catalogo recompõe o texto uma vez por transação.
+    cursor.execute("DROP TRIGGER IF EXISTS busca_episodio_insert")
+    cursor.execute("DROP TRIGGER IF EXISTS busca_episodio_update")
+    cursor.execute("DROP TRIGGER IF EXISTS busca_episodio_delete")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS BuscaPendente (
+            midia_id INTEGER PRIMARY KEY
+        );
+    """)
+
+    for evento, linhas in (("INSERT", ("NEW",)),
+                           ("UPDATE OF nome, temporada_id", ("OLD", "NEW")),
+                           ("DELETE", ("OLD",))):
+        nome = evento.split()[0].lower()
+        marcacoes = "\n".join(f"""
+                INSERT OR IGNORE INTO BuscaPendente (midia_id)
+                SELECT serie_id FROM Temporada WHERE id = {linha}.temporada_id;"""
+                               for linha in linhas)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS busca_episodio_{nome} AFTER {evento} ON Episodio
+            BEGIN{marcacoes}
+            END;
+        """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS busca_temporada_update AFTER UPDATE OF serie_id ON Temporada
+        BEGIN
+            INSERT OR IGNORE INTO BuscaPendente (midia_id) VALUES (OLD.serie_id);
+            INSERT OR IGNORE INTO BuscaPendente (midia_id) VALUES (NEW.serie_id);
+        END;
+    """)
+
+
+def _v10_exclusao_em_cascata(cursor: sqlite3.Cursor):
+
+    # O SQLite não altera chaves estrangeiras de tabelas existentes: Temporada
+    # e Episodio são recriadas com ON DELETE CASCADE. Roda com foreign_keys
+    # desligado (o Catalogo só liga a verificação depois das migrações).
+    # Índices e triggers somem com as tabelas antigas e são recriados a
+    # partir do SQL guardado.
+    objetos = cursor.execute("""
+        SELECT sql FROM sqlite_master
+        WHERE tbl_name IN ('Temporada', 'Episodio') AND type IN ('index', 'trigger')
+              AND sql IS NOT NULL
+        ORDER BY type, name
+    """).fetchall()
+    sequencias = dict(cursor.execute(
+        "SELECT name, seq FROM sqlite_sequence WHERE name IN ('Temporada', 'Episodio')").fetchall())
+
+    # Temporadas e episódios órfãos não são alcançáveis por nenhuma mídia e
+    # violariam as novas chaves.
+    cursor.execute("""
+        DELETE FROM Temporada
+        WHERE serie_id IS NULL OR serie_id NOT IN (SELECT id FROM Midia)
+    """)
+    cursor.execute("""
+        DELETE FROM Episodio
+        WHERE temporada_id IS NULL OR temporada_id NOT IN (SELECT id FROM Temporada)
+    """)
+
+    cursor.execute("""
+        CREATE TABLE Temporada_nova (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            serie_id INTEGER NOT NULL,
+            numero INTEGER NOT NULL,
+            nome TEXT,
+            total_episodios INTEGER NOT NULL DEFAULT 0,
+            duracao_total INTEGER NOT NULL DEFAULT 0,
+            FOREIGN KEY (serie_id) REFERENCES Midia (id) ON DELETE CASCADE
+        );
+    """)
+    cursor.execute("""
+        CREATE TABLE Episodio_nova (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            temporada_id INTEGER NOT NULL,
+            numero INTEGER NOT NULL,
+            nome TEXT,
+            duracao_minutos INTEGER,
+            FOREIGN KEY (temporada_id) REFERENCES Temporada (id) ON DELETE CASCADE
+        );
+    """)
+    cursor.execute("""
+        INSERT INTO Temporada_nova (id, serie_id, numero, nome, total_episodios, duracao_total)
+        SELECT id, serie_id, numero, nome, total_episodios, duracao_total FROM Temporada
+    """)
+    cursor.execute("""
+        INSERT INTO Episodio_nova (id, temporada_id, numero, nome, duracao_minutos)
+        SELECT id, temporada_id, numero, nome, duracao_minutos FROM Episodio
+    """)
+
+    cursor.execute("DROP TABLE Episodio")
+    cursor.execute("DROP TABLE Temporada")
+    cursor.execute("ALTER TABLE Temporada_nova RENAME TO Temporada")
+    cursor.execute("ALTER TABLE Episodio_nova RENAME TO Episodio")
+
+    # As sequências do AUTOINCREMENT continuam de onde estavam, para que ids
+    # de linhas já removidas não sejam reutilizados.
+    for tabela in ("Temporada", "Episodio"):
+        maior_id = cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {tabela}").fetchone()[0]
+        cursor.execute("DELETE FROM sqlite_sequence WHERE name = ?", (tabela,))
+        cursor.execute("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)",
+                       (tabela, max(sequencias.get(tabela, 0), maior_id)))
+
+    for (sql,) in objetos:
+        cursor.execute(sql)
+
+
+def _v11_indices_paginacao(cursor: sqlite3.Cursor):
+
+    # Índices para a listagem paginada por (titulo, id): o id vem de graça,
+    # pois é o rowid guardado em toda entrada de índice. Os índices por tipo e
+    # por status passam a incluir o título e substituem os da migração 3.
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_midia_titulo ON Midia (titulo)")
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_midia_tipo_titulo ON Midia (tipo_midia, titulo)")
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_midia_status_titulo ON Midia (status_visualizacao, titulo)")
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_midia_genero_titulo ON Midia (genero, titulo)")
+    cursor.execute("DROP INDEX IF EXISTS idx_midia_tipo")
+    cursor.execute("DROP INDEX IF EXISTS idx_midia_status")
+
+
+MIGRACOES: List[Tuple[int, Callable[[sqlite3.Cursor], None]]] = [
+    (1, _v1_schema_inicial),
+    (2, _v2_log_alteracoes),
+    (3, _v3_indices),
+    (4, _v4_indices_estatisticas),
+    (5, _v5_indices_ranking),
+    (6, _v6_busca_textual),
+    (7, _v7_elenco_normalizado),
+    (8, _v8_totais_desnormalizados),
+    (9, _v9_busca_episodios_adiada),
+    (10, _v10_exclusao_em_cascata),
+    (11, _v11_indices_paginacao),
+]
+
+VERSAO_SCHEMA = MIGRACOES[-1][0]
+
+
+def versao_schema(conn: sqlite3.Connection) -> int:
+
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def aplicar_migracoes(conn: sqlite3.Connection) -> int:
+    """Aplica, em ordem, as migrações pendentes e retorna a versão final do schema."""
+
+    versao_atual = versao_schema(conn)
+    if versao_atual > VERSAO_SCHEMA:
+        raise RuntimeError(
+            f"O banco está na versão {versao_atual}, mais nova que a suportada ({VERSAO_SCHEMA}).")
+
+    for versao, migracao in MIGRACOES:
+        if versao <= versao_atual:
+            continue
+
+        if conn.in_transaction:
+            conn.commit()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("BEGIN")
+            migracao(cursor)
+            cursor.execute(f"PRAGMA user_version = {versao}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        versao_atual = versao
+
+    return versao_atual
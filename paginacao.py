@@ -0,0 +1,102 @@
+import sqlite3
+from typing import List, Optional, Tuple
+
+from midia import Midia, StatusVisualizacao, TipoMidia
+
+
+# Paginação por chave (keyset) sobre (titulo, id): cada página continua a
+# partir da última chave vista, usando os índices de título da migração 11,
+# então o custo de uma página não depende da posição nem do tamanho do catálogo.
+ORDEM_PAGINA = "titulo, id"
+
+Chave = Tuple[str, int]
+
+
+class Pagina:
+    """Uma página da listagem por título, com o necessário para navegar."""
+
+    def __init__(self, midias: List[Midia], tem_anterior: bool, tem_proxima: bool):
+        self.midias = midias
+        self.tem_anterior = tem_anterior
+        self.tem_proxima = tem_proxima
+
+    @property
+    def primeira(self) -> Optional[Chave]:
+        """Chave da primeira mídia; passada como `antes` volta uma página."""
+        return (self.midias[0].titulo, self.midias[0]._id) if self.midias else None
+
+    @property
+    def ultima(self) -> Optional[Chave]:
+        """Chave da última mídia; passada como `apos` avança uma página."""
+        return (self.midias[-1].titulo, self.midias[-1]._id) if self.midias else None
+
+
+def _filtros(tipo: Optional[TipoMidia], status: Optional[StatusVisualizacao],
+             genero: Optional[str]) -> Tuple[List[str], list]:
+
+    filtros: List[str] = []
+    parametros: list = []
+    if tipo is not None:
+        filtros.append("tipo_midia = ?")
+        parametros.append(tipo.name)
+    if status is not None:
+        filtros.append("status_visualizacao = ?")
+        parametros.append(status.name)
+    if genero is not None:
+        filtros.append("genero = ?")
+        parametros.append(genero)
+    return filtros, parametros
+
+
+def _existe(conn: sqlite3.Connection, filtros: List[str], parametros: list,
+            comparacao: str, chave: Chave) -> bool:
+
+    condicoes = filtros + [f"(titulo, id) {comparacao} (?, ?)"]
+    return conn.execute(
+        f"SELECT 1 FROM Midia WHERE {' AND '.join(condicoes)} LIMIT 1",
+        parametros + list(chave)).fetchone() is not None
+
+
+def ids_pagina(conn: sqlite3.Connection, tamanho: int, apos: Optional[Chave] = None,
+               antes: Optional[Chave] = None, tipo: Optional[TipoMidia] = None,
+               status: Optional[StatusVisualizacao] = None,
+               genero: Optional[str] = None) -> Tuple[List[int], bool, bool]:
+    """Ids de uma página em ordem de título e se há páginas antes e depois dela.
+
+    Com `apos`, retorna as mídias seguintes a essa chave; com `antes`, as
+    anteriores; sem nenhuma das duas, a primeira página.
+    """
+
+    filtros, parametros = _filtros(tipo, status, genero)
+    condicoes = list(filtros)
+    if antes is not None:
+        condicoes.append("(titulo, id) < (?, ?)")
+        ordem = "titulo DESC, id DESC"
+        parametros_consulta = parametros + list(antes)
+    else:
+        if apos is not None:
+            condicoes.append("(titulo, id) > (?, ?)")
+        ordem = ORDEM_PAGINA
+        parametros_consulta = parametros + (list(apos) if apos is not None else [])
+    onde = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+
+    linhas = conn.execute(f"""
+        SELECT titulo, id FROM Midia
+        {onde}
+        ORDER BY {ordem}
+        LIMIT ?
+    """, parametros_consulta + [tamanho]).fetchall()
+    if antes is not None:
+        if len(linhas) < tamanho:
+            # Voltando até o início, a página fica completa como a primeira.
+            return ids_pagina(conn, tamanho, tipo=tipo, status=status, genero=genero)
+        linhas.reverse()
+
+    if not linhas:
+        return [], False, False
+
+    # Uma consulta indexada de cada lado diz se há mais páginas, mesmo quando
+    # mídias vizinhas foram removidas desde a página anterior.
+    tem_anterior = _existe(conn, filtros, parametros, "<", tuple(linhas[0]))
+    tem_proxima = _existe(conn, filtros, parametros, ">", tuple(linhas[-1]))
+    return [midia_id for _, midia_id in linhas], tem_anterior, tem_proxima
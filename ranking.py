@@ -0,0 +1,77 @@
+import heapq
+import sqlite3
+from typing import List, Optional, Tuple
+
+from midia import TipoMidia
+
+
+# Desempate determinístico: maior avaliação, depois título e id crescentes.
+# Cada consulta usa um dos índices de ranking (migração 5), que já entregam
+# as linhas nessa ordem; o LIMIT para a leitura após N linhas, sem ordenar.
+ORDEM_RANKING = "avaliacao DESC, titulo, id"
+
+Entrada = Tuple[float, str, int]
+
+
+def _consultar(conn: sqlite3.Connection, tipo: TipoMidia, n: int,
+               genero: Optional[str], decada: Optional[int]) -> List[Entrada]:
+
+    filtros = ["tipo_midia = ?", "status_visualizacao = 'CONCLUIDO'", "avaliacao > 0"]
+    parametros: list = [tipo.name]
+    if genero is not None:
+        filtros.append("genero = ?")
+        parametros.append(genero)
+    if decada is not None:
+        # Mesma expressão do índice idx_midia_ranking_decada.
+        filtros.append("ano_lancamento / 10 = ?")
+        parametros.append(decada // 10)
+    parametros.append(n)
+
+    return conn.execute(f"""
+        SELECT avaliacao, titulo, id FROM Midia
+        WHERE {' AND '.join(filtros)}
+        ORDER BY {ORDEM_RANKING}
+        LIMIT ?
+    """, parametros).fetchall()
+
+
+def ids_ranking(conn: sqlite3.Connection, n: int = 10, tipo: Optional[TipoMidia] = None,
+                genero: Optional[str] = None, decada: Optional[int] = None) -> List[int]:
+    """Ids das N mídias mais bem avaliadas, opcionalmente por tipo, gênero e década.
+
+    Sem tipo, os N primeiros de cada tipo são intercalados com heapq.merge,
+    mantendo o custo em O(N log N) em vez de ordenar o catálogo.
+    """
+
+    if n <= 0:
+        return []
+
+    tipos = [tipo] if tipo is not None else list(TipoMidia)
+    listas = [_consultar(conn, t, n, genero, decada) for t in tipos]
+    if len(listas) == 1:
+        return [midia_id for _, _, midia_id in listas[0]]
+
+    intercaladas = heapq.merge(*listas, key=lambda e: (-e[0], e[1], e[2]))
+    return [midia_id for _, _, midia_id in list(intercaladas)[:n]]
+
+
+def generos_avaliados(conn: sqlite3.Connection, tipo: Optional[TipoMidia] = None) -> List[str]:
+
+    tipos = [tipo] if tipo is not None else list(TipoMidia)
+    marcadores = ",".join("?" * len(tipos))
+    return [row[0] for row in conn.execute(f"""
+        SELECT DISTINCT genero FROM Midia
+        WHERE tipo_midia IN ({marcadores}) AND status_visualizacao = 'CONCLUIDO' AND avaliacao > 0
+        ORDER BY genero
+    """, [t.name for t in tipos])]
+
+
+def decadas_avaliadas(conn: sqlite3.Connection, tipo: Optional[TipoMidia] = None) -> List[int]:
+
+    tipos = [tipo] if tipo is not None else list(TipoMidia)
+    marcadores = ",".join("?" * len(tipos))
+    return [row[0] * 10 for row in conn.execute(f"""
+        SELECT DISTINCT ano_lancamento / 10 FROM Midia
+        WHERE tipo_midia IN ({marcadores}) AND status_visualizacao = 'CONCLUIDO' AND avaliacao > 0
+        ORDER BY 1
+    """, [t.name for t in tipos])]
@@ -0,0 +1,337 @@
+"""API HTTP/JSON somente leitura sobre o catálogo, só com a biblioteca padrão.
+
+Endpoints (GET ou HEAD):
+    /midias                   listagem por título, paginada por cursor
+                              (?tamanho=20&apos=<cursor>|antes=<cursor>
+                              &tipo=FILME|SERIE&status=...&genero=...)
+    /midias/<id>              uma mídia; séries incluem a árvore de temporadas
+    /busca?q=<texto>          busca textual (&limite=50)
+    /estatisticas             estatísticas gerais (&top_n=10)
+
+Toda resposta leva um ETag derivado de Catalogo.versao_dados: enquanto o
+banco não muda, um cliente que reenvia If-None-Match recebe 304 sem que nada
+seja recalculado, e os corpos já montados são servidos de um cache em
+memória. Escritas de outras conexões (CLI, importador) mudam a versão.
+
+Uso: python servidor.py [--db dados.db] [--host 127.0.0.1] [--porta 8000]
+     [--threads 8] [--perfil producao]
+"""
+import argparse
+import base64
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from catalogo import Catalogo
+from conexao import PERFIS
+from midia import Midia, StatusVisualizacao, TipoMidia
+from midia_concreta import Filme, Serie
+from paginacao import Chave
+
+
+# Quantidade de respostas (por caminho e query) mantidas no cache.
+LIMITE_CACHE = 256
+TAMANHO_PAGINA_PADRAO = 20
+TAMANHO_PAGINA_MAXIMO = 200
+# Conexões ociosas (keep-alive) são fechadas após esse tempo, liberando a thread.
+TIMEOUT_CONEXAO_SEGUNDOS = 10
+
+
+class ErroRequisicao(Exception):
+    """Erro do cliente, respondido com o status HTTP informado."""
+
+    def __init__(self, status: HTTPStatus, mensagem: str):
+        super().__init__(mensagem)
+        self.status = status
+
+
+def resumo_midia(midia: Midia) -> Dict[str, Any]:
+    """Dicionário da mídia sem a árvore de temporadas (usa os totais da série)."""
+
+    dados = Midia.to_dict(midia)
+    if isinstance(midia, Filme):
+        dados['duracao_minutos'] = midia.duracao_minutos
+    elif isinstance(midia, Serie):
+        dados['total_temporadas'] = midia.total_temporadas
+        dados['total_episodios'] = midia.total_episodios
+        dados['duracao_total'] = midia.duracao_total
+    return dados
+
+
+def codificar_cursor(chave: Optional[Chave]) -> Optional[str]:
+
+    if chave is None:
+        return None
+    texto = json.dumps(list(chave), ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(texto).decode("ascii").rstrip("=")
+
+
+def decodificar_cursor(cursor: str) -> Chave:
+
+    try:
+        texto = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        titulo, midia_id = json.loads(texto)
+        if not isinstance(titulo, str) or not isinstance(midia_id, int):
+            raise ValueError
+    except (TypeError, ValueError):
+        raise ErroRequisicao(HTTPStatus.BAD_REQUEST, "Cursor inválido.") from None
+    return titulo, midia_id
+
+
+def _parametro(query: Dict[str, List[str]], nome: str) -> Optional[str]:
+
+    valores = query.get(nome)
+    return valores[-1] if valores else None
+
+
+def _inteiro(query: Dict[str, List[str]], nome: str, padrao: int,
+             minimo: int = 1, maximo: Optional[int] = None) -> int:
+
+    valor = _parametro(query, nome)
+    if valor is None:
+        return padrao
+    try:
+        numero = int(valor)
+    except ValueError:
+        raise ErroRequisicao(HTTPStatus.BAD_REQUEST, f"'{nome}' deve ser um inteiro.") from None
+    if numero < minimo or (maximo is not None and numero > maximo):
+        raise ErroRequisicao(HTTPStatus.BAD_REQUEST, f"'{nome}' fora do intervalo permitido.")
+    return numero
+
+
+def _enum(query: Dict[str, List[str]], nome: str, tipo_enum):
+
+    valor = _parametro(query, nome)
+    if valor is None:
+        return None
+    try:
+        return tipo_enum[valor.upper()]
+    except KeyError:
+        opcoes = ", ".join(e.name for e in tipo_enum)
+        raise ErroRequisicao(HTTPStatus.BAD_REQUEST, f"'{nome}' deve ser um de {opcoes}.") from None
+
+
+class ApiCatalogo:
+    """Monta as respostas JSON da API e o cache delas por ETag."""
+
+    def __init__(self, catalogo: Catalogo):
+        self.catalogo = catalogo
+        # Distingue esta execução do servidor: o data_version recomeça a cada
+        # conexão, e um ETag de uma execução anterior não pode valer agora.
+        self._instancia = format(time.time_ns(), "x")
+        self._cache: "OrderedDict[str, Tuple[str, bytes]]" = OrderedDict()
+        self._trava_cache = threading.Lock()
+
+    def etag(self) -> str:
+
+        data_version, escritas = self.catalogo.versao_dados
+        return f'"{self._instancia}-{data_version}-{escritas}"'
+
+    def responder(self, caminho: str) -> Tuple[str, bytes]:
+        """Retorna (etag, corpo JSON) para o caminho com query, usando o cache."""
+
+        # O ETag é lido antes de montar o corpo: se o banco mudar no meio, o
+        # corpo pode ser mais novo que o ETag, nunca mais antigo.
+        etag = self.etag()
+        with self._trava_cache:
+            em_cache = self._cache.get(caminho)
+            if em_cache is not None and em_cache[0] == etag:
+                self._cache.move_to_end(caminho)
+                return em_cache
+
+        corpo = json.dumps(self._montar(caminho), ensure_ascii=False).encode("utf-8")
+        with self._trava_cache:
+            self._cache[caminho] = (etag, corpo)
+            self._cache.move_to_end(caminho)
+            while len(self._cache) > LIMITE_CACHE:
+                self._cache.popitem(last=False)
+        return etag, corpo
+
+    def _montar(self, caminho: str) -> Any:
+
+        partes = urlsplit(caminho)
+        query = parse_qs(partes.query)
+        segmentos = [s for s in partes.path.split("/") if s]
+
+        if segmentos == ["midias"]:
+            return self._listar(query)
+        if len(segmentos) == 2 and segmentos[0] == "midias":
+            return self._midia(segmentos[1])
+        if segmentos == ["busca"]:
+            return self._buscar(query)
+        if segmentos == ["estatisticas"]:
+            return self._estatisticas(query)
+        raise ErroRequisicao(HTTPStatus.NOT_FOUND, "Recurso não encontrado.")
+
+    def _listar(self, query: Dict[str, List[str]]) -> Dict[str, Any]:
+
+        apos = _parametro(query, "apos")
+        antes = _parametro(query, "antes")
+        if apos is not None and antes is not None:
+            raise ErroRequisicao(HTTPStatus.BAD_REQUEST, "Use 'apos' ou 'antes', não os dois.")
+        pagina = self.catalogo.pagina_midias(
+            _inteiro(query, "tamanho", TAMANHO_PAGINA_PADRAO, maximo=TAMANHO_PAGINA_MAXIMO),
+            apos=decodificar_cursor(apos) if apos is not None else None,
+            antes=decodificar_cursor(antes) if antes is not None else None,
+            tipo=_enum(query, "tipo", TipoMidia),
+            status=_enum(query, "status", StatusVisualizacao),
+            genero=_parametro(query, "genero"))
+        return {
+            'midias': [resumo_midia(m) for m in pagina.midias],
+            'anterior': codificar_cursor(pagina.primeira) if pagina.tem_anterior else None,
+            'proxima': codificar_cursor(pagina.ultima) if pagina.tem_proxima else None,
+        }
+
+    def _midia(self, segmento: str) -> Dict[str, Any]:
+
+        try:
+            midia_id = int(segmento)
+        except ValueError:
+            raise ErroRequisicao(HTTPStatus.NOT_FOUND, "Mídia não encontrada.") from None
+        midia = self.catalogo.obter_midia_por_id(midia_id)
+        if midia is None:
+            raise ErroRequisicao(HTTPStatus.NOT_FOUND, "Mídia não encontrada.")
+        return midia.to_dict()
+
+    def _buscar(self, query: Dict[str, List[str]]) -> Dict[str, Any]:
+
+        texto = _parametro(query, "q")
+        if not texto:
+            raise ErroRequisicao(HTTPStatus.BAD_REQUEST, "Informe o texto da busca em 'q'.")
+        limite = _inteiro(query, "limite", 50, maximo=TAMANHO_PAGINA_MAXIMO)
+        return {'midias': [resumo_midia(m) for m in self.catalogo.buscar(texto, limite)]}
+
+    def _estatisticas(self, query: Dict[str, List[str]]) -> Dict[str, Any]:
+
+        stats = dict(self.catalogo.obter_estatisticas_gerais(
+            top_n=_inteiro(query, "top_n", 10, maximo=100)))
+        stats['top10_filmes'] = [resumo_midia(m) for m in stats['top10_filmes']]
+        stats['top10_series'] = [resumo_midia(m) for m in stats['top10_series']]
+        return stats
+
+
+class ManipuladorApi(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+    timeout = TIMEOUT_CONEXAO_SEGUNDOS
+    # Cabeçalhos e corpo saem em escritas separadas; com o Nagle ligado, a
+    # resposta em keep-alive esperaria o ACK atrasado do cliente (~40 ms).
+    disable_nagle_algorithm = True
+    server: "ServidorCatalogo"
+
+    def do_GET(self):
+        self._atender(com_corpo=True)
+
+    def do_HEAD(self):
+        self._atender(com_corpo=False)
+
+    def _atender(self, com_corpo: bool):
+
+        api = self.server.api
+        # Revalidação barata: um PRAGMA e uma comparação, sem montar nada.
+        etag = api.etag()
+        if etag in self._etags_cliente():
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        try:
+            etag, corpo = api.responder(self.path)
+            status = HTTPStatus.OK
+        except ErroRequisicao as e:
+            etag, corpo, status = None, self._erro(str(e)), e.status
+        except Exception as e:
+            self.log_error("Erro ao responder %s: %r", self.path, e)
+            etag, corpo, status = None, self._erro("Erro interno."), HTTPStatus.INTERNAL_SERVER_ERROR
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(corpo)))
+        if etag is not None:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        if com_corpo:
+            self.wfile.write(corpo)
+
+    def _etags_cliente(self) -> List[str]:
+
+        cabecalho = self.headers.get("If-None-Match", "")
+        return [etag.strip() for etag in cabecalho.split(",") if etag.strip()]
+
+    @staticmethod
+    def _erro(mensagem: str) -> bytes:
+        return json.dumps({'erro': mensagem}, ensure_ascii=False).encode("utf-8")
+
+    def log_message(self, formato: str, *args):
+        # Sem log por requisição: polls frequentes inundariam a saída.
+        pass
+
+
+class ServidorCatalogo(ThreadingHTTPServer):
+    """Servidor HTTP com um número fixo de threads e um Catalogo compartilhado.
+
+    As requisições são atendidas por um pool de threads, e não por uma
+    thread nova cada, pois cada thread leitora do Catalogo concorrente mantém
+    sua própria conexão com o banco.
+    """
+
+    def __init__(self, endereco: Tuple[str, int], catalogo: Catalogo, threads: int = 8):
+        super().__init__(endereco, ManipuladorApi)
+        self.api = ApiCatalogo(catalogo)
+        self._executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="api")
+
+    def process_request(self, request, client_address):
+        self._executor.submit(self.process_request_thread, request, client_address)
+
+    def server_close(self):
+        super().server_close()
+        self._executor.shutdown(wait=True)
+
+
+def criar_servidor(db_path: Path, host: str = "127.0.0.1", porta: int = 8000,
+                   threads: int = 8, perfil: str = "producao") -> ServidorCatalogo:
+    """Abre o catálogo no modo concorrente, sem carregá-lo em memória, e cria o servidor."""
+
+    catalogo = Catalogo(db_path=db_path, carregar=False, perfil=perfil, concorrente=True)
+    if not catalogo.conn:
+        raise RuntimeError(f"Não foi possível abrir o banco {db_path}.")
+    return ServidorCatalogo((host, porta), catalogo, threads)
+
+
+def main(argv: Optional[List[str]] = None):
+
+    parser = argparse.ArgumentParser(description="Serve o catálogo como uma API HTTP/JSON somente leitura.")
+    parser.add_argument("--db", type=Path, default=Path("dados.db"))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8000)
+    parser.add_argument("--threads", type=int, default=8)
+    # O modo concorrente do Catalogo exige WAL.
+    parser.add_argument("--perfil", default="producao",
+                        choices=sorted(n for n, p in PERFIS.items() if p.journal_mode == "WAL"))
+    args = parser.parse_args(argv)
+
+    servidor = criar_servidor(args.db, args.host, args.porta, args.threads, args.perfil)
+    print(f"Servindo {args.db} em http://{args.host}:{servidor.server_address[1]}/ (Ctrl+C para sair)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        servidor.api.catalogo.fechar_conexao()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
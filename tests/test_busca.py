@@ -0,0 +1,41 @@
+"""Busca textual do Catalogo (FTS5)."""
+import pytest
+
+from catalogo import Catalogo
+from midia_concreta import Filme
+
+
+@pytest.fixture
+def catalogo(tmp_path):
+
+    catalogo = Catalogo(db_path=tmp_path / "catalogo.db", carregar=False)
+    catalogo.adicionar_midias_em_lote(
+        [Filme(f"Filme {i:03d}", "Drama", 2000, 90, ["Ator A"]) for i in range(30)]
+        + [Filme("Noite de drama", "Comédia", 2001, 90, ["Ator B"]),
+           Filme("Outro", "Comédia", 2002, 90, ["Ana Noite"])])
+    yield catalogo
+    catalogo.fechar_conexao()
+
+
+def titulos(midias):
+    return [m.titulo for m in midias]
+
+
+def test_termos_de_um_caractere_sao_ignorados(catalogo):
+
+    assert catalogo.buscar("a") == []
+    assert titulos(catalogo.buscar("a noite")) == ["Noite de drama", "Outro"]
+
+
+def test_casamento_no_titulo_vem_antes_do_genero(catalogo):
+
+    resultado = catalogo.buscar("drama", limite=5)
+    assert titulos(resultado)[0] == "Noite de drama"
+    assert all(m.genero == "Drama" for m in resultado[1:])
+    assert len(resultado) == 5
+
+
+def test_busca_combina_colunas(catalogo):
+
+    assert titulos(catalogo.buscar("noite comédia")) == ["Noite de drama", "Outro"]
+    assert titulos(catalogo.buscar("filme drama", limite=3)) == ["Filme 000", "Filme 001", "Filme 002"]
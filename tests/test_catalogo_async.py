@@ -0,0 +1,196 @@
+"""Agrupamento de leituras, cancelamento e latência do loop no AsyncCatalogo."""
+import asyncio
+import threading
+
+import pytest
+
+from benchmarks.ingestao_lote import gerar_midias
+from benchmarks.latencia_async import sentinela
+from catalogo import Catalogo
+from catalogo_async import AsyncCatalogo
+from midia_concreta import Filme
+
+ESPERA_SEGUNDOS = 5
+# Atraso máximo tolerado do event loop com leituras em andamento: folgado
+# para o ruído do agendador, mas abaixo do que uma rodada de carga do teste,
+# feita direto no loop, causa.
+ATRASO_MAXIMO_MS = 50
+TAMANHO_CARGA = 5000
+
+
+@pytest.fixture
+def db_path(tmp_path):
+
+    caminho = tmp_path / "catalogo.db"
+    catalogo = Catalogo(db_path=caminho, carregar=False)
+    catalogo.adicionar_midias_em_lote(gerar_midias(50))
+    catalogo.fechar_conexao()
+    return caminho
+
+
+class Bloqueio:
+    """Substitui um método do Catalogo por um que conta as chamadas e só
+    retorna quando liberado, avisando quando começou a rodar no executor."""
+
+    def __init__(self, catalogo: Catalogo, nome: str):
+        self.chamadas = 0
+        self.iniciou = threading.Event()
+        self.liberado = threading.Event()
+        original = getattr(catalogo, nome)
+
+        def bloqueado(*args, **kwargs):
+            self.chamadas += 1
+            self.iniciou.set()
+            self.liberado.wait(ESPERA_SEGUNDOS)
+            return original(*args, **kwargs)
+        setattr(catalogo, nome, bloqueado)
+
+    async def esperar_inicio(self):
+
+        iniciou = await asyncio.get_running_loop().run_in_executor(
+            None, self.iniciou.wait, ESPERA_SEGUNDOS)
+        assert iniciou
+
+
+def contar_titulo(db_path, titulo):
+
+    catalogo = Catalogo(db_path=db_path, carregar=False)
+    try:
+        return catalogo.conn.execute(
+            "SELECT COUNT(*) FROM Midia WHERE titulo = ?", (titulo,)).fetchone()[0]
+    finally:
+        catalogo.fechar_conexao()
+
+
+@pytest.mark.parametrize("concorrente", [True, False])
+def test_leituras_simultaneas_sao_agrupadas(db_path, concorrente):
+
+    async def cenario():
+        async with AsyncCatalogo(db_path, concorrente=concorrente) as catalogo:
+            bloqueio = Bloqueio(catalogo.catalogo, "obter_estatisticas_gerais")
+            tarefas = [asyncio.create_task(catalogo.obter_estatisticas_gerais()) for _ in range(10)]
+            await bloqueio.esperar_inicio()
+            bloqueio.liberado.set()
+            resultados = await asyncio.gather(*tarefas)
+            assert bloqueio.chamadas == 1
+            assert all(r is resultados[0] for r in resultados)
+
+            # Concluída a leitura, a próxima roda de novo.
+            await catalogo.obter_estatisticas_gerais()
+            assert bloqueio.chamadas == 2
+
+    asyncio.run(cenario())
+
+
+def test_leitura_nao_e_agrupada_atraves_de_escrita(db_path):
+
+    async def cenario():
+        async with AsyncCatalogo(db_path, concorrente=False) as catalogo:
+            bloqueio = Bloqueio(catalogo.catalogo, "obter_estatisticas_gerais")
+            antes = asyncio.create_task(catalogo.obter_estatisticas_gerais())
+            await bloqueio.esperar_inicio()
+            escrita = asyncio.create_task(
+                catalogo.adicionar_midia(Filme("Entre leituras", "Drama", 2001, 100, ["Ator A"])))
+            depois = asyncio.create_task(catalogo.obter_estatisticas_gerais())
+            await asyncio.sleep(0)
+            bloqueio.liberado.set()
+
+            stats_antes, _, stats_depois = await asyncio.gather(antes, escrita, depois)
+            assert bloqueio.chamadas == 2
+            assert stats_depois['total'] == stats_antes['total'] + 1
+
+    asyncio.run(cenario())
+
+
+def test_cancelar_antes_de_comecar_nao_executa(db_path):
+
+    async def cenario():
+        async with AsyncCatalogo(db_path, concorrente=False) as catalogo:
+            # A única thread do executor fica ocupada com a leitura.
+            bloqueio = Bloqueio(catalogo.catalogo, "obter_estatisticas_gerais")
+            leitura = asyncio.create_task(catalogo.obter_estatisticas_gerais())
+            await bloqueio.esperar_inicio()
+
+            escrita = asyncio.create_task(
+                catalogo.adicionar_midia(Filme("Cancelado", "Drama", 2001, 100, ["Ator A"])))
+            await asyncio.sleep(0)
+            escrita.cancel()
+            # O cancelamento chega ao executor por um callback do loop.
+            await asyncio.sleep(0)
+            bloqueio.liberado.set()
+            await leitura
+            with pytest.raises(asyncio.CancelledError):
+                await escrita
+            # Esvazia a fila do executor antes de conferir o banco.
+            await catalogo.versao_dados()
+
+    asyncio.run(cenario())
+    assert contar_titulo(db_path, "Cancelado") == 0
+
+
+def test_cancelar_depois_de_comecar_conclui_a_operacao(db_path):
+
+    async def cenario():
+        async with AsyncCatalogo(db_path, concorrente=False) as catalogo:
+            bloqueio = Bloqueio(catalogo.catalogo, "adicionar_midia")
+            escrita = asyncio.create_task(
+                catalogo.adicionar_midia(Filme("Já iniciado", "Drama", 2001, 100, ["Ator A"])))
+            await bloqueio.esperar_inicio()
+            escrita.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await escrita
+            bloqueio.liberado.set()
+            await catalogo.versao_dados()
+
+    asyncio.run(cenario())
+    assert contar_titulo(db_path, "Já iniciado") == 1
+
+
+@pytest.mark.parametrize("concorrente", [True, False])
+def test_cancelar_uma_leitura_agrupada_preserva_as_outras(db_path, concorrente):
+
+    async def cenario():
+        async with AsyncCatalogo(db_path, concorrente=concorrente) as catalogo:
+            bloqueio = Bloqueio(catalogo.catalogo, "obter_estatisticas_gerais")
+            cancelada = asyncio.create_task(catalogo.obter_estatisticas_gerais())
+            mantida = asyncio.create_task(catalogo.obter_estatisticas_gerais())
+            await bloqueio.esperar_inicio()
+            cancelada.cancel()
+            await asyncio.sleep(0)
+            bloqueio.liberado.set()
+
+            stats = await mantida
+            assert stats['total'] == 50
+            assert cancelada.cancelled()
+            assert bloqueio.chamadas == 1
+
+    asyncio.run(cenario())
+
+
+def test_loop_continua_responsivo_sob_carga(tmp_path):
+
+    db_path = tmp_path / "carga.db"
+    catalogo = Catalogo(db_path=db_path, carregar=False)
+    catalogo.adicionar_midias_em_lote(gerar_midias(TAMANHO_CARGA))
+    catalogo.fechar_conexao()
+
+    async def cenario():
+        async with AsyncCatalogo(db_path) as catalogo:
+            atrasos = []
+            parar = asyncio.Event()
+            tarefa = asyncio.create_task(sentinela(atrasos, parar))
+            for rodada in range(10):
+                # Argumentos diferentes na rodada: as leituras não são todas
+                # agrupadas, então as threads do executor trabalham de fato.
+                # Feita direto no loop, uma rodada passa do limite sozinha.
+                await asyncio.gather(
+                    *(catalogo.obter_estatisticas_gerais(top_n=5 + i) for i in range(10)),
+                    *(catalogo.buscar(f"Série {rodada * 10 + i:03d}") for i in range(10)),
+                    catalogo.buscar("Filme"))
+            parar.set()
+            await tarefa
+            return atrasos
+
+    atrasos = asyncio.run(cenario())
+    assert len(atrasos) > 10
+    assert max(atrasos) < ATRASO_MAXIMO_MS
@@ -0,0 +1,102 @@
+"""O agregado de estatísticas do Catalogo contra o cálculo direto no SQL."""
+import pytest
+
+from benchmarks.gerador import gerar_catalogo
+from catalogo import Catalogo
+from midia import Episodio, StatusVisualizacao, TipoMidia
+from midia_concreta import Filme
+
+
+@pytest.fixture
+def db_path(tmp_path):
+
+    caminho = tmp_path / "catalogo.db"
+    catalogo = Catalogo(db_path=caminho, carregar=False)
+    catalogo.adicionar_midias_em_lote(gerar_catalogo(300, 30, semente=7))
+    catalogo.fechar_conexao()
+    return caminho
+
+
+@pytest.fixture
+def catalogo(db_path):
+
+    catalogo = Catalogo(db_path=db_path)
+    yield catalogo
+    catalogo.fechar_conexao()
+
+
+def estatisticas_sql(db_path, top_n=10):
+
+    catalogo = Catalogo(db_path=db_path, carregar=False)
+    try:
+        return catalogo.obter_estatisticas_gerais(top_n=top_n)
+    finally:
+        catalogo.fechar_conexao()
+
+
+def conferir(stats, esperado):
+
+    for chave in ('total', 'filmes', 'series', 'status', 'total_horas_assistidas', 'generos'):
+        assert stats[chave] == esperado[chave], chave
+    assert stats['media_avaliacao'] == pytest.approx(esperado['media_avaliacao'], abs=0.01)
+    for chave in ('top10_filmes', 'top10_series'):
+        assert [m._id for m in stats[chave]] == [m._id for m in esperado[chave]], chave
+
+
+def test_agregado_confere_com_sql_apos_carga(catalogo, db_path):
+
+    conferir(catalogo.obter_estatisticas_gerais(verificar=True), estatisticas_sql(db_path))
+
+
+def test_agregado_acompanha_escritas_locais(catalogo, db_path):
+
+    filmes = catalogo.obter_midias_por_tipo(TipoMidia.FILME)
+    for midia in filmes[:20]:
+        midia.status_visualizacao = StatusVisualizacao.CONCLUIDO
+        midia.avaliacao = 9.5
+        catalogo.atualizar_midia(midia)
+    catalogo.remover_midias([m._id for m in filmes[20:40]])
+    catalogo.adicionar_midia(Filme("Novo local", "Drama", 2020, 100, ["Ator A"],
+                                   StatusVisualizacao.CONCLUIDO, 10.0))
+
+    serie = next(s for s in catalogo.obter_midias_por_tipo(TipoMidia.SERIE)
+                 if s.status_visualizacao == StatusVisualizacao.CONCLUIDO)
+    temporada = serie.temporadas[-1]
+    catalogo.adicionar_episodio_em_temporada(
+        serie._id, temporada.numero, Episodio(max(e.numero for e in temporada.episodios) + 1, "Extra", 50))
+
+    conferir(catalogo.obter_estatisticas_gerais(verificar=True), estatisticas_sql(db_path))
+
+
+def test_agregado_confere_apos_alteracao_externa(catalogo, db_path):
+
+    antes = catalogo.obter_estatisticas_gerais()
+
+    externo = Catalogo(db_path=db_path, carregar=False)
+    melhor = externo.obter_midia_por_id(antes['top10_filmes'][0]._id)
+    melhor.avaliacao = 1.0
+    externo.atualizar_midia(melhor)
+    externo.adicionar_midia(Filme("Novo externo", "Drama", 2021, 120, ["Ator B"],
+                                  StatusVisualizacao.CONCLUIDO, 10.0))
+    externo.remover_midias([antes['top10_series'][0]._id])
+    externo.fechar_conexao()
+
+    stats = catalogo.obter_estatisticas_gerais(verificar=True)
+    conferir(stats, estatisticas_sql(db_path))
+    assert stats['total'] == antes['total']
+    assert stats['top10_filmes'][0].titulo == "Novo externo"
+    assert melhor._id not in [m._id for m in stats['top10_filmes']]
+
+
+def test_verificar_aponta_agregado_inconsistente(catalogo):
+
+    catalogo._soma_avaliacoes += 100
+    with pytest.raises(RuntimeError):
+        catalogo.obter_estatisticas_gerais(verificar=True)
+
+
+def test_verificar_aponta_titulo_ausente_do_ranking(catalogo):
+
+    stats = catalogo.obter_estatisticas_gerais(top_n=5)
+    stats['top10_filmes'] = stats['top10_filmes'][:-1]
+    assert 'top10_filmes' in catalogo.verificar_agregado(stats, top_n=5)
@@ -0,0 +1,48 @@
+"""Sincronização do Catalogo carregado com escritas de outras conexões."""
+import sqlite3
+
+import pytest
+
+from benchmarks.ingestao_lote import gerar_midias
+from catalogo import Catalogo
+from midia_concreta import Filme
+
+
+@pytest.fixture
+def db_path(tmp_path):
+
+    caminho = tmp_path / "catalogo.db"
+    catalogo = Catalogo(db_path=caminho, carregar=False)
+    catalogo.adicionar_midias_em_lote(gerar_midias(100))
+    catalogo.fechar_conexao()
+    return caminho
+
+
+def test_recarga_incremental_relê_so_as_alteradas(db_path, monkeypatch):
+
+    catalogo = Catalogo(db_path=db_path)
+    ids = sorted(catalogo._por_id)
+
+    externo = Catalogo(db_path=db_path, carregar=False)
+    externo.remover_midias(ids[:3])
+    externo.adicionar_midia(Filme("AAA externo", "Drama", 2000, 90, ["Ator X"]))
+    externo.fechar_conexao()
+    conn = sqlite3.connect(db_path)
+    conn.execute("UPDATE Midia SET titulo = 'ZZZ renomeado' WHERE id = ?", (ids[10],))
+    conn.commit()
+    conn.close()
+
+    relidos = []
+    carregar_grafo = catalogo._carregar_grafo
+    monkeypatch.setattr(catalogo, "_carregar_grafo",
+                        lambda midia_ids=None: relidos.append(midia_ids) or carregar_grafo(midia_ids))
+    catalogo.carregar_midias()
+
+    assert len(relidos) == 1 and len(relidos[0]) == 5
+    titulos = [m.titulo for m in catalogo.midias]
+    assert titulos == sorted(titulos)
+    assert titulos[0] == "AAA externo" and titulos[-1] == "ZZZ renomeado"
+    assert len(titulos) == len(catalogo._por_id) == 98
+    assert not set(ids[:3]) & set(catalogo._por_id)
+    assert catalogo.verificar_agregado() == {}
+    catalogo.fechar_conexao()